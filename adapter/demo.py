@@ -1,6 +1,35 @@
-import os, argparse
+import asyncio, csv, os, argparse
 from searoutes_adapter import SearoutesAdapter
 
+def read_lanes(path, args):
+    """Read lanes from a CSV with a header row: from,to[,from_date,to_date,carrier,equipment].
+
+    Missing/blank optional columns fall back to the corresponding CLI options.
+    """
+    lanes = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            lanes.append((
+                row["from"], row["to"],
+                row.get("from_date") or args.from_date,
+                row.get("to_date") or args.to_date,
+                row.get("carrier") or args.carrier_scac,
+                row.get("equipment") or args.equipment,
+            ))
+    return lanes
+
+def print_rows(rows, from_locode, to_locode, equipment):
+    if not rows:
+        print("No itineraries found."); return
+    print(f"Found {len(rows)} itineraries for {from_locode} → {to_locode} ({equipment})\n")
+    for i, r in enumerate(rows, start=1):
+        print(f"{i:02d}. {r['carrier']} [{r['carrierScac']}] | Service {r['serviceId']} | {r['vesselName']} {r['voyage']} (IMO {r['imo']})")
+        print(f"    ETD {r['fromLocode']} {r['etd_local']}  →  ETA {r['toLocode']} {r['eta_local']}  | Transit {r['transit_days']} days")
+        print("    Legs:")
+        for leg in r["legs"]:
+            print(f"      {leg['seq']}: {leg['portLocodeFrom']} {leg['timeFrom']} → {leg['portLocodeTo']} {leg['timeTo']} ({leg['transitDays']}d)")
+        print()
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--from", dest="from_locode", default="EGALY")
@@ -9,23 +38,24 @@ def main():
     ap.add_argument("--to-date", default="2025-09-05")
     ap.add_argument("--carrier", dest="carrier_scac", default=None)
     ap.add_argument("--equipment", default="40RF")
+    ap.add_argument("--lanes", default=None, help="CSV of lanes to search concurrently (header: from,to[,from_date,to_date,carrier,equipment])")
+    ap.add_argument("--concurrency", type=int, default=10)
     ap.add_argument("--real", action="store_true")
     args = ap.parse_args()
 
     base_url = os.getenv("SEAROUTES_URL", "https://api.searoutes.com") if args.real else os.getenv("SEAROUTES_URL", "http://localhost:4010")
-    adapter = SearoutesAdapter(base_url=base_url, api_key=os.getenv("SEAROUTES_API_KEY"))
-
-    rows = adapter.search(args.from_locode, args.to_locode, args.from_date, args.to_date, args.carrier_scac, args.equipment)
-    if not rows:
-        print("No itineraries found."); return
-    print(f"Found {len(rows)} itineraries for {args.from_locode} → {args.to_locode} ({args.equipment})\n")
-    for i, r in enumerate(rows, start=1):
-        print(f"{i:02d}. {r['carrier']} [{r['carrierScac']}] | Service {r['serviceId']} | {r['vesselName']} {r['voyage']} (IMO {r['imo']})")
-        print(f"    ETD {r['fromLocode']} {r['etd_local']}  →  ETA {r['toLocode']} {r['eta_local']}  | Transit {r['transit_days']} days")
-        print("    Legs:")
-        for leg in r["legs"]:
-            print(f"      {leg['seq']}: {leg['portLocodeFrom']} {leg['timeFrom']} → {leg['portLocodeTo']} {leg['timeTo']} ({leg['transitDays']}d)")
-        print()
+    # One adapter (and its pooled connection) for the whole run; closed on exit
+    with SearoutesAdapter(base_url=base_url, api_key=os.getenv("SEAROUTES_API_KEY")) as adapter:
+        if args.lanes:
+            lanes = read_lanes(args.lanes, args)
+            results = asyncio.run(adapter.search_many(lanes, concurrency=args.concurrency))
+            for lane, rows in zip(lanes, results):
+                if isinstance(rows, BaseException):
+                    print(f"Search failed for {lane[0]} → {lane[1]} ({lane[5]}): {rows}\n"); continue
+                print_rows(rows, lane[0], lane[1], lane[5])
+            return
+        rows = adapter.search(args.from_locode, args.to_locode, args.from_date, args.to_date, args.carrier_scac, args.equipment)
+    print_rows(rows, args.from_locode, args.to_locode, args.equipment)
 
 if __name__ == "__main__":
     main()
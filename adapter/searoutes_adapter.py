@@ -1,59 +1,176 @@
-import os, requests
-from typing import List, Dict, Any
-from dateutil import parser as dtparser
+import asyncio, os, threading, time
+import httpx, orjson
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
+
+# Keep-alive pool shared by all requests from one adapter, so repeated searches
+# reuse the TCP/TLS connection instead of re-handshaking every call
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=30)
+
+# Identical searches within this window are served from memory
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 1024
+
+def _date_key(value: str) -> str:
+    # One cache-key spelling per ISO timestamp: "2025-09-01", "2025-09-01T00:00:00" and
+    # ".000" fractions agree, as do "Z" and "+00:00". Naive and UTC times stay distinct,
+    # since upstream may read them differently; unparseable values are kept as sent
+    try:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value).isoformat()
+    except ValueError:
+        return value
+
+def _copy_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Cached rows are shared by every caller; hand out copies (legs included) so a caller
+    # editing its rows can't change what the cache serves next
+    return [{**row, "legs": [dict(leg) for leg in row["legs"]]} for row in rows]
 
 class SearoutesAdapter:
-    def __init__(self, base_url: str | None = None, api_key: str | None = None, timeout: int = 30):
+    def __init__(self, base_url: str | None = None, api_key: str | None = None, timeout: int = 30, cache_ttl: float = CACHE_TTL_SECONDS):
         self.base_url = base_url or os.getenv("SEAROUTES_URL", "http://localhost:4010")
         self.api_key  = api_key  or os.getenv("SEAROUTES_API_KEY")
         self.timeout  = timeout
+        self.headers  = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self.client   = httpx.Client(base_url=self.base_url, headers=self.headers, timeout=timeout, limits=POOL_LIMITS)
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # Single-flight: concurrent identical searches wait on the first caller's request
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+    def close(self) -> None:
+        self.client.close()
+    def __enter__(self) -> "SearoutesAdapter":
+        return self
+    def __exit__(self, *exc) -> None:
+        self.close()
+    def _params(self, from_locode: str, to_locode: str, from_date: str | None = None, to_date: str | None = None, carrier_scac: str | None = None, equipment: str | None = None) -> Dict[str, str]:
+        # Codes are case-insensitive upstream; normalizing them also makes cache keys match
+        params = {"fromLocode": from_locode.strip().upper(), "toLocode": to_locode.strip().upper()}
+        if from_date: params["fromDate"] = from_date.strip()
+        if to_date:   params["toDate"]   = to_date.strip()
+        if carrier_scac: params["carrierScac"] = carrier_scac.strip().upper()
+        if equipment: params["equipment"] = equipment.strip().upper()
+        return params
+    def _key(self, params: Dict[str, str]) -> Tuple:
+        return tuple(sorted((k, _date_key(v) if k in ("fromDate", "toDate") else v) for k, v in params.items()))
+    def _cache_get(self, key: Tuple) -> List[Dict[str, Any]] | None:
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] >= self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return hit[1]
+    def _cache_put(self, key: Tuple, rows: List[Dict[str, Any]]) -> None:
+        self._cache[key] = (time.monotonic(), rows)
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
     def search(self, from_locode: str, to_locode: str, from_date: str | None = None, to_date: str | None = None, carrier_scac: str | None = None, equipment: str | None = None) -> List[Dict[str, Any]]:
-        params = {"fromLocode": from_locode, "toLocode": to_locode}
-        if from_date: params["fromDate"] = from_date
-        if to_date:   params["toDate"]   = to_date
-        if carrier_scac: params["carrierScac"] = carrier_scac
-        if equipment: params["equipment"] = equipment
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        r = requests.get(f"{self.base_url}/itinerary/v2/execution", params=params, headers=headers, timeout=self.timeout)
-        r.raise_for_status()
-        payload = r.json()
-        return [self._map_item(item) for item in payload.get("items", [])]
+        params = self._params(from_locode, to_locode, from_date, to_date, carrier_scac, equipment)
+        key = self._key(params)
+        with self._lock:
+            rows = self._cache_get(key)
+            if rows is not None:
+                return _copy_rows(rows)
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+        if not leader:
+            return _copy_rows(fut.result())
+        try:
+            r = self.client.get("/itinerary/v2/execution", params=params)
+            r.raise_for_status()
+            rows = self._parse(r.content)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if rows is not None:
+                    self._cache_put(key, rows)
+        fut.set_result(rows)
+        return _copy_rows(rows)
+    async def search_many(self, lanes: Iterable[Sequence[str | None]], concurrency: int = 10) -> List[List[Dict[str, Any]] | BaseException]:
+        """Run several searches concurrently; each lane is a tuple of `search()` positional args.
+
+        Results come back in the same order as `lanes`; duplicate lanes share one request.
+        A lane whose search fails gets its exception in place of rows, so one bad lane
+        doesn't discard the others.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=self.timeout, limits=POOL_LIMITS) as client:
+            async def fetch(key: Tuple, params: Dict[str, str]) -> List[Dict[str, Any]]:
+                with self._lock:
+                    rows = self._cache_get(key)
+                if rows is not None:
+                    return rows
+                async with sem:
+                    r = await client.get("/itinerary/v2/execution", params=params)
+                r.raise_for_status()
+                rows = self._parse(r.content)
+                with self._lock:
+                    self._cache_put(key, rows)
+                return rows
+            tasks: Dict[Tuple, asyncio.Task] = {}
+            pending = []
+            for lane in lanes:
+                params = self._params(*lane)
+                key = self._key(params)
+                if key not in tasks:
+                    tasks[key] = asyncio.ensure_future(fetch(key, params))
+                pending.append(tasks[key])
+            # Every task finishes before the client closes, failed or not
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            return [r if isinstance(r, BaseException) else _copy_rows(r) for r in results]
+    def _parse(self, content: bytes) -> List[Dict[str, Any]]:
+        # Decode the raw body and reshape it in one step; the payload dict is never kept around
+        return list(map(self._map_item, orjson.loads(content).get("items") or ()))
     def _map_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        features = item.get("features", [])
         legs = []
-        for i, f in enumerate(features, start=1):
-            p = f.get("properties", {})
-            legs.append({
+        append = legs.append
+        total_transit_days = 0
+        for i, f in enumerate(item.get("features") or (), start=1):
+            # Bind each nested object once instead of re-walking p.get(...) per field
+            p   = f.get("properties") or {}
+            dep = p.get("departure") or {}
+            arr = p.get("arrival") or {}
+            ves = p.get("vessel") or {}
+            td  = p.get("transitTimeDays")
+            total_transit_days += td or 0
+            append({
                 "seq": i,
-                "portLocodeFrom": p.get("departure", {}).get("locode"),
-                "timeFrom": p.get("departure", {}).get("time"),
-                "portLocodeTo": p.get("arrival", {}).get("locode"),
-                "timeTo": p.get("arrival", {}).get("time"),
+                "portLocodeFrom": dep.get("locode"),
+                "timeFrom": dep.get("time"),
+                "portLocodeTo": arr.get("locode"),
+                "timeTo": arr.get("time"),
                 "carrier": p.get("carrier"),
                 "carrierScac": p.get("carrierScac"),
                 "serviceId": p.get("serviceId"),
-                "vesselName": (p.get("vessel") or {}).get("name"),
-                "imo": (p.get("vessel") or {}).get("imo"),
-                "voyage": (p.get("vessel") or {}).get("voyage"),
-                "transitDays": p.get("transitTimeDays"),
+                "vesselName": ves.get("name"),
+                "imo": ves.get("imo"),
+                "voyage": ves.get("voyage"),
+                "transitDays": td,
             })
-        total_transit_days = sum(l.get("transitDays") or 0 for l in legs)
-        first_dep = legs[0]["timeFrom"] if legs else None
-        last_arr  = legs[-1]["timeTo"]  if legs else None
+        first = legs[0]  if legs else {}
+        last  = legs[-1] if legs else {}
         return {
             "hash": item.get("hash"),
-            "carrier": legs[0]["carrier"] if legs else None,
-            "carrierScac": legs[0]["carrierScac"] if legs else None,
-            "serviceId": legs[0]["serviceId"] if legs else None,
-            "vesselName": legs[0]["vesselName"] if legs else None,
-            "imo": legs[0]["imo"] if legs else None,
-            "voyage": legs[0]["voyage"] if legs else None,
-            "fromLocode": legs[0]["portLocodeFrom"] if legs else None,
-            "toLocode": legs[-1]["portLocodeTo"] if legs else None,
-            "etd_local": first_dep,
-            "eta_local": last_arr,
+            "carrier": first.get("carrier"),
+            "carrierScac": first.get("carrierScac"),
+            "serviceId": first.get("serviceId"),
+            "vesselName": first.get("vesselName"),
+            "imo": first.get("imo"),
+            "voyage": first.get("voyage"),
+            "fromLocode": first.get("portLocodeFrom"),
+            "toLocode": last.get("portLocodeTo"),
+            "etd_local": first.get("timeFrom"),
+            "eta_local": last.get("timeTo"),
             "legs": legs,
             "transit_days": total_transit_days
         }
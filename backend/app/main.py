@@ -2,12 +2,14 @@ import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .providers.fixtures import FixturesProvider
 from .providers.searoutes import SearoutesProvider
-from .routes.carriers import router as carriers_router
-from .routes.ports import router as ports_router
-from .routes.schedules import router as schedules_router
+from .routes.carriers import load_carriers_data, router as carriers_router
+from .routes.ports import load_ports_data, router as ports_router
+from .routes.schedules import router as schedules_router, set_provider
 
 # Provider selection via environment variable
 provider_name = os.environ.get("PROVIDER", "fixtures").lower()
@@ -16,7 +18,12 @@ if provider_name == "searoutes":
 else:
     schedule_provider = FixturesProvider()
 
-app = FastAPI(title="Searoutes Mock API", version="1.0.0")
+app = FastAPI(
+    title="Searoutes Mock API",
+    version="1.0.0",
+    # orjson-backed responses; handlers return ORJSONResponse directly to skip jsonable_encoder
+    default_response_class=ORJSONResponse,
+)
 
 # CORS for local dev / browser UI
 origins = [
@@ -34,9 +41,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Inject provider into routes
-from .routes.schedules import set_provider
+# Schedule lists are highly repetitive JSON/CSV; compress anything over 1 KB
+# (level 5 keeps CPU cost low for a good share of the ratio)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
+# Inject provider into routes
 set_provider(schedule_provider)
 
 # Register routers
@@ -44,6 +53,11 @@ app.include_router(schedules_router)
 app.include_router(ports_router)
 app.include_router(carriers_router)
 
+# Build the port/carrier search indexes while the app loads instead of on each
+# worker's first search request; a missing or malformed data file fails here
+load_ports_data()
+load_carriers_data()
+
 
 @app.get("/health")
 def health_check():
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class ScheduleLeg(BaseModel):
@@ -38,3 +38,21 @@ class Schedule(BaseModel):
     equipment: Optional[str] = None  # "20DC", "40DC", "40HC", "40RF", etc.
     legs: Optional[List[ScheduleLeg]] = None  # Detailed leg information for multi-leg journeys
     hash: Optional[str] = None  # Searoutes itinerary hash for CO2 details lookup
+
+
+# Validates/serializes whole lists of schedules in one pydantic-core call
+# instead of a Python-level loop over Schedule(**item) / model_dump()
+SCHEDULE_LIST_ADAPTER = TypeAdapter(List[Schedule])
+
+
+class ScheduleListResponse(BaseModel):
+    """Envelope returned by GET /api/schedules.
+
+    Used only to document the response in OpenAPI; handlers return pre-serialized
+    responses so it is never used to re-validate outgoing data.
+    """
+
+    items: List[Schedule]
+    total: int
+    page: int
+    pageSize: int
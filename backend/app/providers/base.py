@@ -1,4 +1,4 @@
-from typing import List, Optional, Protocol, Tuple
+from typing import Iterator, List, Optional, Protocol, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -29,3 +29,12 @@ class ScheduleProvider(Protocol):
     def list(self, flt: ScheduleFilter, page: Page) -> Tuple[List[Schedule], Page]:
         """Return (items, page_meta) after filtering/pagination."""
         ...
+
+    def iter(self, flt: ScheduleFilter) -> Iterator[Schedule]:
+        """Yield every schedule matching the filter, unpaginated, in sort order.
+
+        Exports consume this instead of one huge list() page. The default still
+        fetches everything through list(); providers that can page or stream
+        upstream should override it.
+        """
+        yield from self.list(flt, Page(page=1, pageSize=10000))[0]
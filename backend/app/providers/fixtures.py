@@ -1,68 +1,129 @@
-import json
+import sys
+from collections import defaultdict
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, NamedTuple, Tuple
 
-from ..models.schedule import Schedule
+from ..models.schedule import SCHEDULE_LIST_ADAPTER, Schedule
 from .base import Page, ScheduleFilter, ScheduleProvider
 
 
+def _to_utc(s: str) -> datetime:
+    # robust parse for Z dates
+    return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+class _FixtureIndex(NamedTuple):
+    """Parsed fixtures plus lookup tables for the exact-match filters."""
+
+    # (schedule, parsed ETD, lowercased origin/destination/carrier, position in the
+    # file), sorted by ETD
+    entries: Tuple[Tuple[Schedule, datetime, str, str, str, int], ...]
+    by_routing_type: Dict[str, Tuple[int, ...]]  # lowercased value -> positions in entries
+    by_equipment: Dict[str, Tuple[int, ...]]
+
+
+def _transit_key(match: Tuple[Schedule, int]) -> Tuple[int, int]:
+    return match[0].transitDays, match[1]
+
+
+def _build_lookup(values: List[str]) -> Dict[str, Tuple[int, ...]]:
+    positions = defaultdict(list)
+    for i, value in enumerate(values):
+        if value:
+            positions[value.lower()].append(i)
+    return {k: tuple(v) for k, v in positions.items()}
+
+
+@lru_cache(maxsize=4)
+def _load_cached(path: str, mtime_ns: int) -> _FixtureIndex:
+    """Parse a fixtures file once per (path, mtime); edits to the file invalidate the entry.
+
+    Each schedule is paired with its parsed ETD, lowercased copies of the
+    substring-filtered fields and its position in the file, and the entries are
+    pre-sorted by ETD.
+    """
+    # Single-pass parse + validation; missing imo/service/equipment use model defaults
+    items = SCHEDULE_LIST_ADAPTER.validate_json(Path(path).read_bytes())
+    entries = []
+    for pos, x in enumerate(items):
+        # The same handful of ports/carriers/codes repeat across rows; intern them
+        # so every row shares one string object per distinct value
+        x.origin = sys.intern(x.origin)
+        x.destination = sys.intern(x.destination)
+        x.carrier = sys.intern(x.carrier)
+        x.routingType = sys.intern(x.routingType)
+        if x.equipment:
+            x.equipment = sys.intern(x.equipment)
+        entries.append(
+            (
+                x,
+                _to_utc(x.etd),
+                sys.intern(x.origin.lower()),
+                sys.intern(x.destination.lower()),
+                sys.intern(x.carrier.lower()),
+                pos,
+            )
+        )
+    entries.sort(key=itemgetter(1))
+    return _FixtureIndex(
+        entries=tuple(entries),
+        by_routing_type=_build_lookup([e[0].routingType for e in entries]),
+        by_equipment=_build_lookup([e[0].equipment for e in entries]),
+    )
+
+
 class FixturesProvider(ScheduleProvider):
     def __init__(self, path: str = "data/fixtures/schedules.sample.json") -> None:
         # Make path relative to project root
         project_root = Path(__file__).parent.parent.parent.parent
         self.path = project_root / path
 
-    def _load(self) -> List[Schedule]:
-        data = json.loads(self.path.read_text(encoding="utf-8"))
-        # Handle missing fields by providing defaults
-        items = []
-        for item in data:
-            # Add missing fields with defaults if not present
-            if "imo" not in item:
-                item["imo"] = None
-            if "service" not in item:
-                item["service"] = None
-            if "equipment" not in item:
-                item["equipment"] = None
-            items.append(Schedule(**item))
-        return items
+    def _load(self) -> _FixtureIndex:
+        return _load_cached(str(self.path), self.path.stat().st_mtime_ns)
 
     def list(self, flt: ScheduleFilter, page: Page) -> Tuple[List[Schedule], Page]:
-        items = self._load()
-
-        def dt(s: str) -> datetime:
-            # robust parse for Z dates
-            return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc)
-
-        # Filtering (for now, Task 3 says ignore filters, but existing code has them)
-        if flt.origin:
-            q = flt.origin.lower()
-            items = [x for x in items if q in x.origin.lower()]
-        if flt.destination:
-            q = flt.destination.lower()
-            items = [x for x in items if q in x.destination.lower()]
+        index = self._load()
+
+        # Exact-match filters resolve through the lookup tables; sorting the
+        # surviving positions keeps the entries in ETD order
+        positions = None
         if flt.routingType:
-            items = [x for x in items if x.routingType.lower() == flt.routingType.lower()]
-        if flt.carrier:
-            q = flt.carrier.lower()
-            items = [x for x in items if q in x.carrier.lower()]
+            positions = set(index.by_routing_type.get(flt.routingType.lower(), ()))
         if flt.equipment:
-            items = [
-                x for x in items if x.equipment and x.equipment.lower() == flt.equipment.lower()
-            ]
-        if flt.date_from:
-            df = dt(flt.date_from)
-            items = [x for x in items if dt(x.etd) >= df]
-        if flt.date_to:
-            dt_to = dt(flt.date_to)
-            items = [x for x in items if dt(x.etd) <= dt_to]
-
-        # Sort by specified field (default: ETD asc)
+            matches = index.by_equipment.get(flt.equipment.lower(), ())
+            positions = set(matches) if positions is None else positions.intersection(matches)
+        if positions is None:
+            entries = index.entries
+        else:
+            entries = [index.entries[i] for i in sorted(positions)]
+
+        # ETD window (against the datetimes parsed at load time) and the substring
+        # filters (against the pre-lowercased fields) are evaluated together in a
+        # single pass over the narrowed entries
+        df = _to_utc(flt.date_from) if flt.date_from else None
+        dt_to = _to_utc(flt.date_to) if flt.date_to else None
+        q_origin = flt.origin.lower() if flt.origin else None
+        q_destination = flt.destination.lower() if flt.destination else None
+        q_carrier = flt.carrier.lower() if flt.carrier else None
+        matches = [
+            (x, pos)
+            for x, etd, origin, destination, carrier, pos in entries
+            if (df is None or etd >= df)
+            and (dt_to is None or etd <= dt_to)
+            and (q_origin is None or q_origin in origin)
+            and (q_destination is None or q_destination in destination)
+            and (q_carrier is None or q_carrier in carrier)
+        ]
+
+        # Sort by specified field (default: ETD asc). Entries are already in ETD
+        # order, so only the transit sort needs work; equal transit times keep
+        # their file order
         if flt.sort == "transit":
-            items.sort(key=lambda x: x.transitDays)
-        else:  # Default to "etd" or any other value
-            items.sort(key=lambda x: dt(x.etd))
+            matches.sort(key=_transit_key)
+        items = [x for x, _ in matches]
 
         total = len(items)
         start = max(0, (page.page - 1) * page.pageSize)
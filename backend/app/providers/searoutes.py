@@ -1,40 +1,107 @@
+import heapq
+import importlib.util
 import logging
 import os
 import random
 import re
+import sys
+import threading
 import time
 import unicodedata
-from datetime import datetime
-from math import ceil
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 from uuid import uuid4
 
 import httpx
+import orjson
 from pydantic import BaseModel
 
 from ..models.schedule import ScheduleLeg
 from .base import Page, Schedule, ScheduleFilter, ScheduleProvider
 
+logger = logging.getLogger(__name__)
 
+# Sort key for the transit sort in _apply_sorting (C-level attribute getter, built once)
+_TRANSIT_KEY = attrgetter("transitDays")
+
+_ONE_DAY = timedelta(days=1)
+
+# datetime.fromisoformat parses a trailing "Z" itself from Python 3.11 on, so the
+# "+00:00" rewrite (one string copy per timestamp) is only needed on older versions
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+_NON_ALNUM_RE = re.compile(r"[^A-Za-z0-9]")
+_TOKEN_SPLIT_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _is_upper_alnum(q: str) -> bool:
+    """True for ASCII strings made only of A-Z and 0-9."""
+    return q.isascii() and q.isalnum() and q == q.upper()
+
+
+def _is_locode(q: str) -> bool:
+    """Accept CC + XXX (last 3 can be alphanumeric), i.e. ^[A-Z]{2}[A-Z0-9]{3}$."""
+    return len(q) == 5 and q[:2].isalpha() and _is_upper_alnum(q)
+
+
+def _is_scac(q: str) -> bool:
+    """SCAC is typically 2-4 alphanumerics, i.e. ^[A-Z0-9]{2,4}$."""
+    return 2 <= len(q) <= 4 and _is_upper_alnum(q)
+
+
+class _CombiningMarkTable(dict):
+    """str.translate table that drops combining marks, filled in lazily per code point."""
+
+    def __missing__(self, cp: int) -> Optional[int]:
+        value = None if unicodedata.combining(chr(cp)) else cp
+        self[cp] = value
+        return value
+
+
+_COMBINING_TBL = _CombiningMarkTable()
+
+
+# Port/carrier names recur across rankings and paginated calls, so the
+# normalization helpers below are memoized
+@lru_cache(maxsize=4096)
 def _ascii_norm(s: str) -> str:
     """Normalize string: strip diacritics, collapse whitespace, casefold."""
     if not s:
         return ""
-    # Strip diacritics -> ASCII, collapse whitespace, lowercase
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    s = re.sub(r"\s+", " ", s)
-    return s.strip().casefold()
+    # Strip diacritics -> ASCII (pure-ASCII input has none), collapse whitespace, lowercase.
+    # normalize() itself returns already-normalized input as is after a quick check,
+    # so no separate is_normalized() screen is needed
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s).translate(_COMBINING_TBL)
+    # split()/join() collapses and trims whitespace in one C pass (same set as regex \s)
+    return " ".join(s.split()).casefold()
+
 
+@lru_cache(maxsize=4096)
+def _alnum_upper(s: str) -> str:
+    """Extract only alphanumeric characters, uppercased (canonical LOCODE/SCAC form).
 
-def _alnum_only(s: str) -> str:
-    """Extract only alphanumeric characters."""
-    return re.sub(r"[^A-Za-z0-9]", "", s or "")
+    Results are interned, so equal codes from a query and from candidates are the
+    same object and the rankers' equality checks resolve on identity.
+    """
+    return sys.intern(_NON_ALNUM_RE.sub("", s or "").upper())
 
 
-def _tokens(s: str) -> List[str]:
+@lru_cache(maxsize=4096)
+def _tokens_from_norm(s_norm: str) -> Tuple[str, ...]:
+    """Split an already _ascii_norm'ed string into alphanumeric tokens."""
+    return tuple(t for t in _TOKEN_SPLIT_RE.split(s_norm) if t)
+
+
+def _tokens(s: str) -> Tuple[str, ...]:
     """Split string into normalized alphanumeric tokens."""
-    return [t for t in re.split(r"[^A-Za-z0-9]+", _ascii_norm(s)) if t]
+    return _tokens_from_norm(_ascii_norm(s))
 
 
 PORT_NOISE_PREFIXES = (
@@ -50,41 +117,78 @@ PORT_NOISE_PREFIXES = (
 
 def _strip_port_noise(s: str) -> str:
     """Strip common port name prefixes to improve matching."""
-    s2 = s
+    # One C-level startswith over all prefixes screens out the (common) no-noise case
+    if not s.startswith(PORT_NOISE_PREFIXES):
+        return s
     for p in PORT_NOISE_PREFIXES:
-        if s2.startswith(p):
-            return s2[len(p) :]
-    return s2
+        if s.startswith(p):
+            return s[len(p) :]
+    return s
+
+
+# Name match tiers shared by _rank_ports and _rank_carriers
+_NAME_EXACT, _NAME_STARTSWITH, _NAME_CONTAINS, _NAME_NO_MATCH = 3, 2, 1, 0
+
+
+@lru_cache(maxsize=4096)
+def _name_match(name_norm: str, q_norm: str, strip_noise: bool = False) -> int:
+    """Best name tier of a candidate for a query, both already _ascii_norm'ed.
+
+    Tiers are checked best first and the first hit returns, so exact and prefix
+    matches never reach the token scan. strip_noise drops port prefixes such as
+    "port of " before the startswith check.
+    """
+    if name_norm and q_norm and name_norm == q_norm:
+        return _NAME_EXACT
+
+    if (_strip_port_noise(name_norm) if strip_noise else name_norm).startswith(q_norm):
+        return _NAME_STARTSWITH
+
+    # Tighter contains: raw substring, or token-based where every query token is a
+    # name token or a prefix of one. Whole-token hits are one set difference; only
+    # leftovers need a prefix scan
+    if q_norm in name_norm:
+        return _NAME_CONTAINS
+    q_tokens = _tokens_from_norm(q_norm)
+    if q_tokens:
+        name_tokens = _tokens_from_norm(name_norm)
+        if all(
+            any(t.startswith(tok) for t in name_tokens)
+            for tok in frozenset(q_tokens).difference(name_tokens)
+        ):
+            return _NAME_CONTAINS
+    return _NAME_NO_MATCH
 
 
 def _port_name(p: dict) -> str:
     """Extract port name from various response formats."""
-    for k in ("displayName", "name", "portName", "shortName"):
-        v = p.get(k)
-        if v:
-            return str(v)
-    # Sometimes nested:
-    v = (p.get("attributes") or {}).get("name")
+    v = (
+        p.get("displayName")
+        or p.get("name")
+        or p.get("portName")
+        or p.get("shortName")
+        # Sometimes nested:
+        or (p.get("attributes") or {}).get("name")
+    )
     return str(v) if v else ""
 
 
 def _port_locode(p: dict) -> str:
     """Extract port LOCODE from various response formats."""
-    for k in ("locode", "unLocode", "code", "unlocode"):
-        v = p.get(k)
-        if v:
-            return str(v)
-    v = (p.get("attributes") or {}).get("locode")
+    v = (
+        p.get("locode")
+        or p.get("unLocode")
+        or p.get("code")
+        or p.get("unlocode")
+        or (p.get("attributes") or {}).get("locode")
+    )
     return str(v) if v else ""
 
 
 def _port_country(p: dict) -> str:
     """Extract port country from various response formats."""
-    for k in ("countryCode", "country", "countryName", "country_code"):
-        v = p.get(k)
-        if v:
-            return str(v)
-    return ""
+    v = p.get("countryCode") or p.get("country") or p.get("countryName") or p.get("country_code")
+    return str(v) if v else ""
 
 
 def _port_size(p: dict) -> int:
@@ -98,31 +202,39 @@ def _port_size(p: dict) -> int:
 
 def _carrier_name(c: dict) -> str:
     """Extract carrier name from various response formats."""
-    for k in ("displayName", "name", "shortName", "legalName", "carrierName", "companyName"):
-        v = c.get(k)
-        if v:
-            return str(v)
-    # Sometimes nested:
-    v = (c.get("attributes") or {}).get("name")
+    v = (
+        c.get("displayName")
+        or c.get("name")
+        or c.get("shortName")
+        or c.get("legalName")
+        or c.get("carrierName")
+        or c.get("companyName")
+        # Sometimes nested:
+        or (c.get("attributes") or {}).get("name")
+    )
     return str(v) if v else ""
 
 
 def _carrier_scac(c: dict) -> str:
     """Extract carrier SCAC from various response formats."""
-    for k in ("scac", "scacCode", "code"):
-        v = c.get(k)
-        if v:
-            return str(v)
-    return ""
+    v = c.get("scac") or c.get("scacCode") or c.get("code")
+    return str(v) if v else ""
 
 
 def _carrier_id(c: dict) -> str:
     """Extract carrier ID from various response formats."""
-    for k in ("id", "carrierId", "companyId"):
-        v = c.get(k)
-        if v:
-            return str(v)
-    return ""
+    v = c.get("id") or c.get("carrierId") or c.get("companyId")
+    return str(v) if v else ""
+
+
+def _leg_etd(leg: dict) -> str:
+    """Extract leg departure time from various response formats."""
+    return leg.get("departure") or leg.get("etd") or leg.get("departureTime") or ""
+
+
+def _leg_eta(leg: dict) -> str:
+    """Extract leg arrival time from various response formats."""
+    return leg.get("arrival") or leg.get("eta") or leg.get("arrivalTime") or ""
 
 
 class SearoutesError(Exception):
@@ -130,16 +242,19 @@ class SearoutesError(Exception):
 
     def __init__(self, message: str, code: Optional[str] = None, request_id: Optional[str] = None):
         self.message = message
-        self.code = code
+        self.code = code or "SEAROUTES_ERROR"
         self.request_id = request_id
+        self._dict: Optional[Dict[str, str]] = None
         super().__init__(message)
 
     def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary for API responses."""
-        result = {"code": self.code or "SEAROUTES_ERROR", "message": self.message}
-        if self.request_id:
-            result["request_id"] = self.request_id
-        return result
+        """Convert to dictionary for API responses (built once; treat as read-only)."""
+        if self._dict is None:
+            result = {"code": self.code, "message": self.message}
+            if self.request_id:
+                result["request_id"] = self.request_id
+            self._dict = result
+        return self._dict
 
 
 class SearoutesRateLimitError(SearoutesError):
@@ -153,13 +268,285 @@ class SearoutesAPIError(SearoutesError):
     """Exception for general API errors (4xx/5xx)."""
 
     def __init__(self, status_code: int, message: str, request_id: Optional[str] = None):
+        self.status_code = status_code
         code = f"HTTP_{status_code}"
         super().__init__(message, code, request_id)
 
 
+# Friendly user messages for Searoutes error codes (see _extract_error_message)
+SEAROUTES_ERROR_MESSAGES = {
+    "3110": "Unknown origin/destination port",
+    "1071": "Carrier not found",
+    "1072": "Carrier not found",
+    # Already handled in _is_no_results_error, but including for completeness
+    "1110": "No routes found for the specified criteria",
+}
+
+# Error message phrases meaning the itinerary search simply found nothing
+NO_RESULTS_PHRASES = (
+    "no itinerary found",
+    "no results",
+    "no itineraries",
+    "no routes found",
+)
+
+
 SEAROUTES_BASE_URL = os.getenv("SEAROUTES_BASE_URL", "https://api.searoutes.com")
 SEAROUTES_API_KEY = os.getenv("SEAROUTES_API_KEY")
 API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "10"))
+# HTTP/2 multiplexes the concurrent lookups over one TLS connection; httpx only
+# supports it when the optional h2 package is installed (pip install "httpx[http2]")
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+# Idle connections are kept for 15s so the back-to-back port/carrier/itinerary
+# calls of one list() reuse the same TLS session
+SEAROUTES_POOL_LIMITS = httpx.Limits(
+    max_connections=64, max_keepalive_connections=32, keepalive_expiry=15.0
+)
+# Resolved port/carrier lookups: 1 hour TTL, least recently used evicted past the bound.
+# Cache entries are stamped with time.monotonic(), so clock changes can't expire or
+# resurrect them
+LOOKUP_CACHE_TTL_SECONDS = 3600
+# UN/LOCODEs are effectively permanent, so port lookups that resolved a LOCODE query to
+# that same LOCODE are kept for a day
+LOCODE_CACHE_TTL_SECONDS = 86400
+LOOKUP_CACHE_MAX_ENTRIES = 512
+# Mapped itineraries per upstream query, so paging through results and then exporting
+# them reuses one /itinerary call; short-lived because sailings do change
+ITINERARY_CACHE_TTL_SECONDS = 60
+ITINERARY_CACHE_MAX_ENTRIES = 256
+# Retry policy: attempts after the first, and backoff bounds (seconds). The cap also
+# clamps server-sent Retry-After so one response can't park a worker indefinitely
+MAX_RETRIES = 3
+# Port/carrier lookups retry less: an expired cache entry can stand in if they fail
+LOOKUP_MAX_RETRIES = 1
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+# Circuit breaker: consecutive upstream failures before failing fast, and how long
+# to fail fast before letting a probe request through
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN_SECONDS = 30.0
+
+# Port/carrier lookups of one list() call are independent; they run side by side here
+_RESOLVE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="searoutes-resolve")
+
+
+def _is_outage(error: Exception) -> bool:
+    """Whether a failed call means Searoutes is unavailable, not that the request was bad."""
+    if isinstance(error, SearoutesAPIError):
+        return not error.code.startswith("HTTP_4")
+    return isinstance(error, SearoutesError)
+
+
+def _safe_json(response: httpx.Response) -> Any:
+    """Decoded response body, or None if it isn't JSON."""
+    try:
+        return orjson.loads(response.content)
+    except (orjson.JSONDecodeError, TypeError):
+        return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait per a Retry-After header (delta-seconds or HTTP-date), if usable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _port_label(port: Optional[Mapping[str, str]]) -> Optional[str]:
+    """Display string ("Name, CC") for a resolved port, or None if unresolved."""
+    return f"{port['name']}, {port['country']}" if port else None
+
+
+def _map_leg(leg: dict, leg_number: int, vessel: str, voyage: str) -> ScheduleLeg:
+    """Map one itinerary leg; vessel/voyage default to the itinerary's own.
+
+    The leg schema is fixed, so every field is a literal-key lookup chain; the
+    departure/arrival chains are shared with _map_single_itinerary.
+    """
+    etd = _leg_etd(leg)
+    eta = _leg_eta(leg)
+    transit = leg.get("transitDays", 0)
+    if not transit and etd and eta:
+        transit = _transit_days(etd, eta)
+
+    return ScheduleLeg(
+        legNumber=leg_number,
+        fromLocode=leg.get("fromLocode") or leg.get("originLocode") or "",
+        fromPort=leg.get("fromPort") or leg.get("originPort") or "",
+        toLocode=leg.get("toLocode") or leg.get("destinationLocode") or "",
+        toPort=leg.get("toPort") or leg.get("destinationPort") or "",
+        etd=etd,
+        eta=eta,
+        vessel=leg.get("vessel") or leg.get("vesselName") or vessel,
+        voyage=leg.get("voyage") or leg.get("voyageNumber") or voyage,
+        transitDays=transit,
+    )
+
+
+@lru_cache(maxsize=2048)
+def _parse_iso(ts: str) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp (trailing Z allowed); None if malformed.
+
+    Memoized: legs of one itinerary and itineraries of one response share timestamps.
+    """
+    try:
+        if _FROMISOFORMAT_ACCEPTS_Z or not ts.endswith("Z"):
+            return datetime.fromisoformat(ts)
+        return datetime.fromisoformat(ts[:-1] + "+00:00")
+    except ValueError:
+        return None
+
+
+def _transit_days(etd: str, eta: str) -> int:
+    """Whole days (rounded up) between two ISO timestamps; 0 if either is unusable."""
+    if not isinstance(etd, str) or not isinstance(eta, str):
+        return 0
+    return _days_between(etd, eta)
+
+
+@lru_cache(maxsize=2048)
+def _days_between(etd: str, eta: str) -> int:
+    """Memoized body of _transit_days; itineraries of one response repeat ETD/ETA pairs.
+
+    Ceil-divides the timedelta by one day in integer arithmetic, so there is no
+    float round trip through total_seconds().
+    """
+    etd_dt = _parse_iso(etd)
+    eta_dt = _parse_iso(eta)
+    if etd_dt is None or eta_dt is None:
+        return 0
+    try:
+        return -((etd_dt - eta_dt) // _ONE_DAY)
+    except TypeError:
+        # Naive vs. aware timestamps can't be compared
+        return 0
+
+
+@lru_cache(maxsize=2048)
+def _etd_epoch(ts: str) -> float:
+    """Epoch seconds of an ETD for sorting; naive times count as UTC, bad ones sort last.
+
+    Comparing the ISO strings themselves misorders timestamps written with
+    different UTC offsets or precision.
+    """
+    dt = _parse_iso(ts) if isinstance(ts, str) else None
+    if dt is None:
+        return float("inf")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _etd_sort_key(schedule: Schedule) -> float:
+    return _etd_epoch(schedule.etd)
+
+
+def _lookup_key(query: str) -> str:
+    """Cache key for a port/carrier lookup."""
+    return _ascii_norm(query)  # Use normalized key for better cache hits
+
+
+def _lookup_ttl(kind: str, cache_key: str, result: Mapping[str, str]) -> float:
+    """TTL of a cached port/carrier lookup, decided by what the query resolved to.
+
+    Only a port query that is the LOCODE of the port it resolved to keeps the day-long
+    TTL. Five-letter names such as "Genoa" look like LOCODEs but resolve by name.
+    """
+    if kind == "port":
+        q_locode = _alnum_upper(cache_key)
+        if _is_locode(q_locode) and _alnum_upper(result.get("locode") or "") == q_locode:
+            return LOCODE_CACHE_TTL_SECONDS
+    return LOOKUP_CACHE_TTL_SECONDS
+
+
+def _run_inline(fn, *args) -> Future:
+    """Run fn now in the calling thread, returning its outcome as a completed Future."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class _CircuitBreaker:
+    """Fail fast while Searoutes is down instead of spending every retry on it.
+
+    Closed until `threshold` consecutive failures, then open for `cooldown` seconds.
+    After that a single caller is let through as a half-open probe; its outcome
+    closes the circuit again or re-opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go upstream now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, failed: bool) -> None:
+        """Record the outcome of a request that allow() let through."""
+        with self._lock:
+            if not failed:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self._probing or self.failures >= self.threshold:
+                    self.opened_at = time.monotonic()
+            self._probing = False
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> httpx.Client:
+    """Return the process-wide Searoutes client, created on first use.
+
+    Sharing one client keeps a single keep-alive connection pool no matter how
+    many SearoutesProvider instances are created (reloads, tests, workers).
+    """
+    headers = {"x-api-key": SEAROUTES_API_KEY} if SEAROUTES_API_KEY else {}
+
+    # Add Accept-Version header if configured
+    accept_version = os.getenv("SEAROUTES_ACCEPT_VERSION")
+    if accept_version:
+        headers["Accept-Version"] = accept_version
+
+    # Add custom User-Agent header for telemetry (Task 23)
+    headers["User-Agent"] = "ScheduleApp/1.0 (SearoutesIntegration)"
+
+    return httpx.Client(
+        base_url=SEAROUTES_BASE_URL,
+        headers=headers,
+        timeout=API_TIMEOUT_SECONDS,
+        # Note: We handle retries manually for better control over rate limits, so the
+        # transport must not retry connection failures on its own
+        transport=httpx.HTTPTransport(retries=0, http2=HTTP2_ENABLED, limits=SEAROUTES_POOL_LIMITS),
+    )
 
 
 class SearoutesProvider(ScheduleProvider):
@@ -170,53 +557,168 @@ class SearoutesProvider(ScheduleProvider):
     """
 
     def __init__(self, client: Optional[httpx.Client] = None) -> None:
-        headers = {"x-api-key": SEAROUTES_API_KEY} if SEAROUTES_API_KEY else {}
+        self.client = client or _get_client()
+
+        # In-memory LRU cache for carrier lookups (1 hour TTL)
+        self._carrier_cache: "OrderedDict[str, Tuple[Mapping[str, str], float]]" = OrderedDict()
+        # In-memory LRU cache for port lookups (1 hour TTL)
+        self._port_cache: "OrderedDict[str, Tuple[Mapping[str, str], float]]" = OrderedDict()
+        # In-memory LRU cache of mapped itineraries per upstream query (60 second TTL)
+        self._itinerary_cache: "OrderedDict[Tuple, Tuple[List[Schedule], float]]" = OrderedDict()
+        # Lookups of one list() call run concurrently and share these caches
+        self._cache_lock = threading.Lock()
+        # Trips after repeated upstream failures so callers fail fast during outages
+        self._breaker = _CircuitBreaker()
+        # Misses being fetched right now, keyed by (kind, cache key), so concurrent
+        # identical lookups share one upstream request
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+
+    def _cache_get(
+        self, cache: OrderedDict, key: Any, now: float, ttl: float = LOOKUP_CACHE_TTL_SECONDS
+    ) -> Optional[Any]:
+        """Return a fresh cached lookup and mark it recently used; drop it if expired."""
+        with self._cache_lock:
+            hit = cache.get(key)
+            if hit is None:
+                return None
+            if now - hit[1] >= ttl:
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return hit[0]
+
+    def _cache_put(
+        self,
+        cache: OrderedDict,
+        key: Any,
+        result: Any,
+        now: float,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """Store a lookup, evicting the least recently used entries past the size bound.
+
+        max_entries defaults to LOOKUP_CACHE_MAX_ENTRIES.
+        """
+        if max_entries is None:
+            max_entries = LOOKUP_CACHE_MAX_ENTRIES
+        with self._cache_lock:
+            cache[key] = (result, now)
+            cache.move_to_end(key)
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+
+    def _lookup_is_cached(self, kind: str, cache: OrderedDict, query: str) -> bool:
+        """Whether _cached_lookup would answer query from cache right now (no LRU touch)."""
+        cache_key = _lookup_key(query)
+        with self._cache_lock:
+            hit = cache.get(cache_key)
+        return hit is not None and time.monotonic() - hit[1] < _lookup_ttl(kind, cache_key, hit[0])
+
+    def _cached_lookup(
+        self, kind: str, cache: OrderedDict, query: str, lookup: Callable[[str], Dict[str, str]]
+    ) -> Mapping[str, str]:
+        """Serve a port/carrier lookup from cache, coalescing concurrent misses.
+
+        Every caller of a key gets the same cached object, so results are stored as
+        read-only MappingProxyType views.
+
+        The first caller for a key runs lookup(query); callers arriving while it is
+        in flight wait for that outcome (result or error) instead of re-requesting.
+        If Searoutes is unavailable (rate limited, 5xx, network, circuit open), an
+        expired entry for the key is served instead of failing (stale-if-error).
+        """
+        cache_key = _lookup_key(query)
+        current_time = time.monotonic()
+
+        # A hit, or the hand-off to an in-flight lookup, takes a single pass under the
+        # lock. An expired entry is dropped but kept aside as the stale fallback
+        flight_key = (kind, cache_key)
+        with self._cache_lock:
+            stale = cache.get(cache_key)
+            if stale is not None:
+                if current_time - stale[1] < _lookup_ttl(kind, cache_key, stale[0]):
+                    cache.move_to_end(cache_key)
+                    return stale[0]
+                del cache[cache_key]
+            future = self._inflight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._inflight[flight_key] = Future()
+        if not leader:
+            return future.result()
 
-        # Add Accept-Version header if configured
-        accept_version = os.getenv("SEAROUTES_ACCEPT_VERSION")
-        if accept_version:
-            headers["Accept-Version"] = accept_version
+        try:
+            result = MappingProxyType(lookup(query))
+        except Exception as e:
+            if stale is not None and _is_outage(e):
+                logger.warning("Serving stale %s lookup for %r: %s", kind, query, e)
+                # Put it back with its original timestamp, so it stays expired and
+                # the next call tries Searoutes again
+                self._cache_put(cache, cache_key, stale[0], stale[1])
+                with self._cache_lock:
+                    self._inflight.pop(flight_key, None)
+                future.set_result(stale[0])
+                return stale[0]
+            with self._cache_lock:
+                self._inflight.pop(flight_key, None)
+            future.set_exception(e)
+            raise
 
-        # Add custom User-Agent header for telemetry (Task 23)
-        headers["User-Agent"] = "ScheduleApp/1.0 (SearoutesIntegration)"
+        self._cache_put(cache, cache_key, result, current_time)
+        with self._cache_lock:
+            self._inflight.pop(flight_key, None)
+        future.set_result(result)
+        return result
 
-        self.client = client or httpx.Client(
-            base_url=SEAROUTES_BASE_URL,
-            headers=headers,
-            timeout=API_TIMEOUT_SECONDS,
-            # Note: We handle retries manually for better control over rate limits
-        )
+    def _make_request(
+        self, endpoint: str, params: Optional[Dict] = None, max_retries: int = MAX_RETRIES
+    ) -> httpx.Response:
+        """Make HTTP request with retry logic and proper error handling.
 
-        # In-memory cache for carrier lookups (1 hour TTL)
-        self._carrier_cache: Dict[str, Tuple[Dict[str, str], float]] = {}
-        # In-memory cache for port lookups (1 hour TTL)
-        self._port_cache: Dict[str, Tuple[Dict[str, str], float]] = {}
+        Guarded by a circuit breaker: 5xx and network failures that outlast all retries
+        count against Searoutes; while the circuit is open calls fail immediately.
+        """
+        if not self._breaker.allow():
+            raise SearoutesError(
+                "Searoutes is temporarily unavailable, please retry shortly", "CIRCUIT_OPEN"
+            )
 
-    def _make_request(
-        self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3
+        failed = True
+        try:
+            response = self._request_with_retries(endpoint, params, max_retries)
+            failed = False
+            return response
+        except SearoutesRateLimitError:
+            # Throttled, but the upstream is up and answering
+            failed = False
+            raise
+        except SearoutesAPIError as e:
+            # 4xx responses are our request's fault, not an outage
+            failed = e.code.startswith("HTTP_5")
+            raise
+        finally:
+            self._breaker.record(failed)
+
+    def _request_with_retries(
+        self, endpoint: str, params: Optional[Dict], max_retries: int
     ) -> httpx.Response:
-        """Make HTTP request with retry logic and proper error handling."""
+        """GET endpoint, retrying 429/5xx/network errors with backoff."""
         last_exception = None
+        delay = BACKOFF_BASE_SECONDS
 
         for attempt in range(max_retries + 1):
             try:
                 response = self.client.get(endpoint, params=params)
 
-                # Handle rate limiting (429) with exponential backoff
+                # Handle rate limiting (429), honoring Retry-After when present
                 if response.status_code == 429:
                     if attempt < max_retries:
-                        # Extract retry-after header if available
-                        retry_after = response.headers.get("retry-after")
-                        if retry_after and retry_after.isdigit():
-                            delay = int(retry_after)
-                        else:
-                            # Exponential backoff with jitter
-                            delay = (2**attempt) + random.uniform(0, 1)
-
+                        delay = self._compute_backoff(delay, response)
                         time.sleep(delay)
                         continue
                     else:
-                        # Final attempt - raise rate limit error
+                        # Final attempt - raise rate limit error. The body is only
+                        # decoded if no request ID header is present
                         request_id = self._extract_request_id(response)
                         raise SearoutesRateLimitError(
                             f"Rate limit exceeded after {max_retries} retries", request_id
@@ -224,17 +726,18 @@ class SearoutesProvider(ScheduleProvider):
 
                 # Handle other 4xx/5xx errors
                 if response.status_code >= 400:
-                    request_id = self._extract_request_id(response)
-                    error_message = self._extract_error_message(response)
-
                     if response.status_code >= 500:
-                        # 5xx errors - retry with backoff
+                        # 5xx errors - retry with backoff (503 may carry Retry-After)
                         if attempt < max_retries:
-                            delay = (2**attempt) + random.uniform(0, 1)
+                            delay = self._compute_backoff(delay, response)
                             time.sleep(delay)
                             continue
 
-                    # Final attempt or 4xx error - raise API error
+                    # Final attempt or 4xx error - raise API error. The body is
+                    # decoded once and shared by both extractors.
+                    body = _safe_json(response)
+                    request_id = self._extract_request_id(response, body)
+                    error_message = self._extract_error_message(response, body)
                     raise SearoutesAPIError(response.status_code, error_message, request_id)
 
                 # Success - return response
@@ -244,15 +747,32 @@ class SearoutesProvider(ScheduleProvider):
                 last_exception = e
                 if attempt < max_retries:
                     # Network error - retry with backoff
-                    delay = (2**attempt) + random.uniform(0, 1)
+                    delay = self._compute_backoff(delay)
                     time.sleep(delay)
                     continue
 
         # All retries exhausted
         raise SearoutesError(f"Network error after {max_retries} retries: {last_exception}")
 
-    def _extract_request_id(self, response: httpx.Response) -> Optional[str]:
-        """Extract Searoutes request ID from response headers or body."""
+    def _compute_backoff(
+        self, prev_delay: float, response: Optional[httpx.Response] = None
+    ) -> float:
+        """Delay before the next attempt.
+
+        429/503 responses with a usable Retry-After are honored (up to the cap);
+        otherwise decorrelated jitter spreads concurrent clients' retries apart.
+        """
+        if response is not None and response.status_code in (429, 503):
+            retry_after = _parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(BACKOFF_CAP_SECONDS, retry_after)
+        return min(BACKOFF_CAP_SECONDS, random.uniform(BACKOFF_BASE_SECONDS, prev_delay * 3))
+
+    def _extract_request_id(self, response: httpx.Response, body: Any = None) -> Optional[str]:
+        """Extract Searoutes request ID from response headers or body.
+
+        body is the already-decoded response body, if the caller has it.
+        """
         # Check common request ID header names
         for header_name in ["x-request-id", "request-id", "x-correlation-id", "correlation-id"]:
             request_id = response.headers.get(header_name)
@@ -260,54 +780,44 @@ class SearoutesProvider(ScheduleProvider):
                 return request_id
 
         # Try to extract from response body
-        try:
-            data = response.json()
-            if isinstance(data, dict):
-                return data.get("requestId") or data.get("request_id") or data.get("correlationId")
-        except:
-            pass
+        data = _safe_json(response) if body is None else body
+        if isinstance(data, dict):
+            return data.get("requestId") or data.get("request_id") or data.get("correlationId")
 
         return None
 
-    def _extract_error_message(self, response: httpx.Response) -> str:
-        """Extract error message from response with friendly error code mapping."""
-        try:
-            data = response.json()
-            if isinstance(data, dict):
-                # Check for Searoutes error code first and map to friendly messages
-                error_code = data.get("code") or data.get("errorCode") or data.get("error_code")
-                if error_code:
-                    friendly_message = self._map_searoutes_error_code(str(error_code))
-                    if friendly_message:
-                        return friendly_message
-
-                # Try various error message fields
-                error_msg = (
-                    data.get("message")
-                    or data.get("error")
-                    or data.get("detail")
-                    or data.get("error_description")
-                )
-                if error_msg:
-                    return str(error_msg)
-        except:
-            pass
+    def _extract_error_message(self, response: httpx.Response, body: Any = None) -> str:
+        """Extract error message from response with friendly error code mapping.
+
+        body is the already-decoded response body, if the caller has it.
+        """
+        data = _safe_json(response) if body is None else body
+        if isinstance(data, dict):
+            # Check for Searoutes error code first and map to friendly messages
+            error_code = data.get("code") or data.get("errorCode") or data.get("error_code")
+            if error_code:
+                friendly_message = self._map_searoutes_error_code(str(error_code))
+                if friendly_message:
+                    return friendly_message
+
+            # Try various error message fields
+            error_msg = (
+                data.get("message")
+                or data.get("error")
+                or data.get("detail")
+                or data.get("error_description")
+            )
+            if error_msg:
+                return str(error_msg)
 
         # Fallback to HTTP status text
         return f"HTTP {response.status_code}: {response.reason_phrase}"
 
     def _map_searoutes_error_code(self, error_code: str) -> Optional[str]:
         """Map Searoutes error codes to friendly user messages."""
-        error_code_mappings = {
-            "3110": "Unknown origin/destination port",
-            "1071": "Carrier not found",
-            "1072": "Carrier not found",
-            # Already handled in _is_no_results_error, but including for completeness
-            "1110": "No routes found for the specified criteria",
-        }
-        return error_code_mappings.get(error_code)
+        return SEAROUTES_ERROR_MESSAGES.get(error_code)
 
-    def resolve_port(self, port_query: str) -> Dict[str, str]:
+    def resolve_port(self, port_query: str) -> Mapping[str, str]:
         """Resolve port by UN/LOCODE or plain text query to {name, locode, country}.
 
         Smart ranking: Exact LOCODE > Exact name > startswith > contains (size as tiebreaker).
@@ -316,39 +826,34 @@ class SearoutesProvider(ScheduleProvider):
             port_query: Either UN/LOCODE (5 chars: 2 letters + 3 alphanumerics) or plain text query
 
         Returns:
-            Dict with keys: name, locode, country
+            Read-only mapping with keys: name, locode, country
 
         Raises:
             httpx.HTTPError: On API errors
             ValueError: If no results found
         """
-        # Check cache first (1 hour TTL)
-        cache_key = _ascii_norm(port_query)  # Use normalized key for better cache hits
-        current_time = time.time()
-
-        if cache_key in self._port_cache:
-            cached_result, cached_time = self._port_cache[cache_key]
-            if current_time - cached_time < 3600:  # 1 hour = 3600 seconds
-                return cached_result
-            else:
-                # Remove expired entry
-                del self._port_cache[cache_key]
+        # Cached for 1 hour (a day for LOCODEs that resolve to themselves); concurrent
+        # identical lookups share one request
+        return self._cached_lookup("port", self._port_cache, port_query, self._lookup_port)
 
+    def _lookup_port(self, port_query: str) -> Dict[str, str]:
+        """Uncached port resolution; see resolve_port."""
         # Accept CC + XXX (last 3 can be alphanumeric), allow spaces/dashes in input
-        clean_q = _alnum_only(port_query).upper()
-        locode_pattern = re.compile(r"^[A-Z]{2}[A-Z0-9]{3}$")
-        is_locode_query = bool(locode_pattern.fullmatch(clean_q))
+        clean_q = _alnum_upper(port_query)
+        is_locode_query = _is_locode(clean_q)
 
         if is_locode_query:
             params = {"locode": clean_q}
-            logging.debug(f"Port resolution: Using LOCODE parameter for query '{port_query}'")
+            logger.debug("Port resolution: Using LOCODE parameter for query '%s'", port_query)
         else:
             params = {"query": port_query}  # keep original for Searoutes' search semantics
-            logging.debug(f"Port resolution: Using name query parameter for query '{port_query}'")
+            logger.debug("Port resolution: Using name query parameter for query '%s'", port_query)
 
-        response = self._make_request("/geocoding/v2/port", params=params)
+        response = self._make_request(
+            "/geocoding/v2/port", params=params, max_retries=LOOKUP_MAX_RETRIES
+        )
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Extract ports list from various response formats
         ports_list = []
@@ -364,8 +869,12 @@ class SearoutesProvider(ScheduleProvider):
         # Fallback for rare cases: if LOCODE lookup failed, try name query once
         if not ports_list and is_locode_query:
             try:
-                resp2 = self._make_request("/geocoding/v2/port", params={"query": port_query})
-                data2 = resp2.json()
+                resp2 = self._make_request(
+                    "/geocoding/v2/port",
+                    params={"query": port_query},
+                    max_retries=LOOKUP_MAX_RETRIES,
+                )
+                data2 = orjson.loads(resp2.content)
                 if isinstance(data2, list):
                     ports_list = data2
                 elif isinstance(data2, dict) and "results" in data2:
@@ -386,9 +895,6 @@ class SearoutesProvider(ScheduleProvider):
             "country": _port_country(best_port),
         }
 
-        # Cache the result
-        self._port_cache[cache_key] = (result, current_time)
-
         return result
 
     def _rank_ports(self, ports: List[dict], query: str, is_locode_query: bool) -> dict:
@@ -398,72 +904,52 @@ class SearoutesProvider(ScheduleProvider):
         """
         if not ports:
             return {}
+        # A lone candidate wins whatever its score; skip the ranking scaffold
+        if len(ports) == 1:
+            return ports[0]
+
+        q_locode = _alnum_upper(query)
+        # Canonical LOCODEs, aligned with ports: extracted once and shared by the
+        # exact-hit pass and the ranking below, which works on positions
+        locodes = [_alnum_upper(_port_locode(p)) for p in ports]
+        candidates = range(len(ports))
+
+        # An exact LOCODE hit is the top score for LOCODE queries, so nothing else can
+        # win; only the size/name tiebreak among the hits themselves is left to rank
+        if is_locode_query and q_locode:
+            exact = [i for i, locode in enumerate(locodes) if locode == q_locode]
+            if len(exact) == 1:
+                return ports[exact[0]]
+            if exact:
+                candidates = exact
 
         q_norm = _ascii_norm(query)
-        q_locode = _alnum_only(query).upper()
-        q_tokens = _tokens(query)
 
-        def extract(p: dict) -> Tuple[int, int, str, dict]:
+        def rank_key(i: int) -> Tuple[int, int, str]:
             # Use robust field extraction
+            p = ports[i]
             name = _port_name(p)
-            locode = _port_locode(p)
-            size_num = _port_size(p)
-
             name_norm = _ascii_norm(name)
-            name_tokens = _tokens(name)
-            locode_up = _alnum_only(locode).upper()
-
-            # Boolean features
-            exact_locode = locode_up and q_locode and locode_up == q_locode
-            exact_name = name_norm and q_norm and name_norm == q_norm
-
-            # Improved startswith / contains logic
-            # Strip port noise for better startswith matching
-            name_for_sw = _strip_port_noise(name_norm)
-            startswith = name_for_sw.startswith(q_norm)
-
-            # Tighter contains: token-based and raw substring
-            has_tokens = bool(q_tokens)
-            token_contains = has_tokens and all(
-                any(t.startswith(tok) or t == tok for t in name_tokens) for tok in q_tokens
-            )
-            contains = token_contains or (q_norm in name_norm)
+            locode_up = locodes[i]
+            exact_locode = bool(locode_up and q_locode and locode_up == q_locode)
+            name_match = _name_match(name_norm, q_norm, True)
 
             # Score strictly per spec
             if is_locode_query:
-                # LOCODE-first
-                if exact_locode:
-                    score = 4
-                elif exact_name:
-                    score = 3
-                elif startswith:
-                    score = 2
-                elif contains:
-                    score = 1
-                else:
-                    score = 0
+                # LOCODE-first: exact LOCODE > exact name > startswith > contains
+                score = 4 if exact_locode else name_match
             else:
-                # Name-first
-                if exact_name:
-                    score = 4
-                elif startswith:
-                    score = 3
-                elif contains:
-                    score = 2
-                elif exact_locode:
-                    score = 1  # allowed but lowest among the four
-                else:
-                    score = 0
-
-            # Return a sorting key tuple and the object
-            # Sort by: score desc, size desc, name asc (stable & deterministic)
-            return (-score, -size_num, name_norm or name, p)
-
-        ranked = [extract(p) for p in ports]
-        ranked.sort()
-        return ranked[0][3]
-
-    def resolve_carrier(self, scac_or_name: str) -> Dict[str, str]:
+                # Name-first: exact name > startswith > contains > exact LOCODE (allowed
+                # but lowest among the four)
+                score = name_match + 1 if name_match else int(exact_locode)
+
+            # Order by: score desc, size desc, name asc (first wins on full ties)
+            return (-score, -_port_size(p), name_norm or name)
+
+        # Only the best candidate is needed, so a single min() pass replaces a full sort
+        return ports[min(candidates, key=rank_key)]
+
+    def resolve_carrier(self, scac_or_name: str) -> Mapping[str, str]:
         """Resolve carrier by SCAC or name to {name, scac, id}.
 
         Smart ranking: Exact SCAC > Exact name > startswith > contains
@@ -472,34 +958,30 @@ class SearoutesProvider(ScheduleProvider):
             scac_or_name: Either SCAC code or carrier name
 
         Returns:
-            Dict with keys: name, scac, id
+            Read-only mapping with keys: name, scac, id
 
         Raises:
             httpx.HTTPError: On API errors
             ValueError: If no results found
         """
-        # Check cache first (1 hour TTL)
-        cache_key = _ascii_norm(scac_or_name)  # Use normalized key for better cache hits
-        current_time = time.time()
-
-        if cache_key in self._carrier_cache:
-            cached_result, cached_time = self._carrier_cache[cache_key]
-            if current_time - cached_time < 3600:  # 1 hour = 3600 seconds
-                return cached_result
-            else:
-                # Remove expired entry
-                del self._carrier_cache[cache_key]
+        # Cached for 1 hour; concurrent identical lookups share one request
+        return self._cached_lookup(
+            "carrier", self._carrier_cache, scac_or_name, self._lookup_carrier
+        )
 
+    def _lookup_carrier(self, scac_or_name: str) -> Dict[str, str]:
+        """Uncached carrier resolution; see resolve_carrier."""
         # Determine if this looks like a SCAC code
-        clean_q = _alnum_only(scac_or_name).upper()
-        scac_pattern = re.compile(r"^[A-Z0-9]{2,4}$")  # SCAC is typically 2-4 alphanumerics
-        is_scac_query = bool(scac_pattern.fullmatch(clean_q))
+        clean_q = _alnum_upper(scac_or_name)
+        is_scac_query = _is_scac(clean_q)
 
         # Call Searoutes API
         params = {"query": scac_or_name}
-        response = self._make_request("/search/v2/carriers", params=params)
+        response = self._make_request(
+            "/search/v2/carriers", params=params, max_retries=LOOKUP_MAX_RETRIES
+        )
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Extract carriers list from various response formats
         carriers = []
@@ -523,9 +1005,6 @@ class SearoutesProvider(ScheduleProvider):
             "id": _carrier_id(best_carrier),
         }
 
-        # Cache the result
-        self._carrier_cache[cache_key] = (result, current_time)
-
         return result
 
     def _rank_carriers(self, carriers: List[dict], query: str, is_scac_query: bool) -> dict:
@@ -535,62 +1014,45 @@ class SearoutesProvider(ScheduleProvider):
         """
         if not carriers:
             return {}
+        # As in _rank_ports, a lone candidate needs no ranking
+        if len(carriers) == 1:
+            return carriers[0]
+
+        q_scac = _alnum_upper(query)
+        # Canonical SCACs, aligned with carriers (see _rank_ports)
+        scacs = [_alnum_upper(_carrier_scac(c)) for c in carriers]
+        candidates = range(len(carriers))
+
+        # As in _rank_ports: for SCAC queries an exact SCAC hit outranks everything,
+        # so only the name tiebreak among the hits themselves is left to rank
+        if is_scac_query and q_scac:
+            exact = [i for i, scac in enumerate(scacs) if scac == q_scac]
+            if len(exact) == 1:
+                return carriers[exact[0]]
+            if exact:
+                candidates = exact
 
         q_norm = _ascii_norm(query)
-        q_scac = _alnum_only(query).upper()
-        q_tokens = _tokens(query)
 
-        def extract(c: dict) -> Tuple[int, str, dict]:
+        def rank_key(i: int) -> Tuple[int, str]:
             # Use robust field extraction
-            name = _carrier_name(c)
-            scac = _carrier_scac(c)
-
+            name = _carrier_name(carriers[i])
             name_norm = _ascii_norm(name)
-            scac_up = _alnum_only(scac).upper()
-            name_tokens = _tokens(name)
-
-            exact_scac = scac_up and q_scac and scac_up == q_scac
-            exact_name = name_norm and q_norm and name_norm == q_norm
-
-            # Improved startswith / contains logic
-            startswith = name_norm.startswith(q_norm)
-
-            # Tighter contains: token-based and raw substring
-            has_tokens = bool(q_tokens)
-            token_contains = has_tokens and all(
-                any(t.startswith(tok) or t == tok for t in name_tokens) for tok in q_tokens
-            )
-            contains = token_contains or (q_norm in name_norm)
+            scac_up = scacs[i]
+            exact_scac = bool(scac_up and q_scac and scac_up == q_scac)
+            name_match = _name_match(name_norm, q_norm)
 
             if is_scac_query:
-                if exact_scac:
-                    score = 4
-                elif exact_name:
-                    score = 3
-                elif startswith:
-                    score = 2
-                elif contains:
-                    score = 1
-                else:
-                    score = 0
+                # SCAC-first: exact SCAC > exact name > startswith > contains
+                score = 4 if exact_scac else name_match
             else:
-                if exact_name:
-                    score = 4
-                elif startswith:
-                    score = 3
-                elif contains:
-                    score = 2
-                elif exact_scac:
-                    score = 1
-                else:
-                    score = 0
-
-            # No explicit tiebreaker specified; use name as stable deterministic sort
-            return (-score, name_norm or name, c)
-
-        ranked = [extract(c) for c in carriers]
-        ranked.sort()
-        return ranked[0][2]
+                # Name-first: exact name > startswith > contains > exact SCAC
+                score = name_match + 1 if name_match else int(exact_scac)
+
+            # No explicit tiebreaker specified; use name as stable deterministic order
+            return (-score, name_norm or name)
+
+        return carriers[min(candidates, key=rank_key)]
 
     def _is_no_results_error(self, error: SearoutesAPIError) -> bool:
         """Check if the error represents 'no itinerary found' (error code 1110)."""
@@ -599,68 +1061,68 @@ class SearoutesProvider(ScheduleProvider):
             return True
 
         # Check for common "no results" phrases
-        no_results_phrases = [
-            "no itinerary found",
-            "no results",
-            "no itineraries",
-            "no routes found",
-        ]
         error_msg_lower = str(error.message).lower()
-        return any(phrase in error_msg_lower for phrase in no_results_phrases)
+        return any(phrase in error_msg_lower for phrase in NO_RESULTS_PHRASES)
 
     def list(self, flt: ScheduleFilter, page: Page) -> Tuple[List[Schedule], Page]:
         """Fetch live itineraries from Searoutes and map to internal Schedule format."""
         try:
-            # 1) Resolve origin/destination to UN/LOCODE if not already in LOCODE format
-            origin_port = None
-            destination_port = None
-
-            if flt.origin:
-                try:
-                    origin_port = self.resolve_port(flt.origin)
-                except SearoutesError:
-                    # Re-raise Searoutes API errors
-                    raise
-                except ValueError:
-                    # Port not found - return empty results
-                    return [], page
+            # 1) Resolve origin/destination to UN/LOCODE if not already in LOCODE format,
+            # and 2) carrier to SCAC if provided. The lookups are independent, so they are
+            # issued concurrently on the shared client (one round-trip of wall time, not three).
+            # Lookups already in the cache are answered inline rather than handed to a
+            # thread, and a lone miss has nothing to overlap with, so it runs inline too
+            lookups = (
+                (self.resolve_port, "port", self._port_cache, flt.origin),
+                (self.resolve_port, "port", self._port_cache, flt.destination),
+                (self.resolve_carrier, "carrier", self._carrier_cache, flt.carrier),
+            )
+            misses = [
+                bool(q) and not self._lookup_is_cached(kind, cache, q)
+                for _, kind, cache, q in lookups
+            ]
+            concurrent = sum(misses) > 1
+            origin_future, destination_future, carrier_future = (
+                (
+                    (_RESOLVE_POOL.submit if concurrent and miss else _run_inline)(resolve, q)
+                    if q
+                    else None
+                )
+                for (resolve, _, _, q), miss in zip(lookups, misses)
+            )
 
-            if flt.destination:
-                try:
-                    destination_port = self.resolve_port(flt.destination)
-                except SearoutesError:
-                    # Re-raise Searoutes API errors
-                    raise
-                except ValueError:
-                    # Port not found - return empty results
-                    return [], page
+            # Results are checked in the same order as the former sequential calls.
+            # Searoutes API errors propagate to the outer handler unchanged.
+            try:
+                origin_port = origin_future.result() if origin_future else None
+                destination_port = destination_future.result() if destination_future else None
+            except ValueError:
+                # Port not found - return empty results; drop lookups that haven't started
+                for future in (destination_future, carrier_future):
+                    if future:
+                        future.cancel()
+                return [], page
 
-            # 2) Resolve carrier to SCAC if provided
             carrier_scac = None
-            if flt.carrier:
+            if carrier_future:
                 try:
-                    carrier_info = self.resolve_carrier(flt.carrier)
-                    carrier_scac = carrier_info.get("scac")
-                except SearoutesError:
-                    # Re-raise Searoutes API errors
-                    raise
+                    carrier_scac = carrier_future.result().get("scac")
                 except ValueError:
                     # Carrier not found - continue without carrier filter
                     pass
 
             # 3) Call /itinerary/v2/execution with proper parameters
-            params = {}
-
-            if origin_port:
-                params["fromLocode"] = origin_port["locode"]
-            if destination_port:
-                params["toLocode"] = destination_port["locode"]
-            if carrier_scac:
-                params["carrierScac"] = carrier_scac
-            if flt.date_from:
-                params["fromDate"] = flt.date_from
-            if flt.date_to:
-                params["toDate"] = flt.date_to
+            params = {
+                key: value
+                for key, value in (
+                    ("fromLocode", origin_port and origin_port["locode"]),
+                    ("toLocode", destination_port and destination_port["locode"]),
+                    ("carrierScac", carrier_scac),
+                    ("fromDate", flt.date_from),
+                    ("toDate", flt.date_to),
+                )
+                if value
+            }
 
             # Add Searoutes sorting support
             # Map sort=transit → sortBy=TRANSIT_TIME; for sort=etd, omit sortBy (Searoutes default order)
@@ -671,29 +1133,53 @@ class SearoutesProvider(ScheduleProvider):
             if flt.nContainers and flt.nContainers > 0:
                 params["nContainers"] = flt.nContainers
 
-            try:
-                response = self._make_request("/itinerary/v2/execution", params=params)
-                data = response.json()
-            except SearoutesAPIError as e:
-                # Handle graceful no-results for error 1110 "no itinerary found"
-                if self._is_no_results_error(e):
-                    # Return empty results with HTTP 200, no 4xx in our API
-                    return [], Page(total=0, page=page.page, pageSize=page.pageSize)
-                else:
-                    # Re-raise other API errors
-                    raise
-
-            # 4) Map response to Schedule items
-            schedules = self._map_itineraries_to_schedules(data, origin_port, destination_port)
-
-            # 5) Apply client-side filtering and sorting
-            filtered_schedules = self._apply_filters(schedules, flt)
-            sorted_schedules = self._apply_sorting(filtered_schedules, flt.sort or "etd")
+            # 4) Map response to Schedule items. The mapping depends only on the
+            # upstream query and the resolved port labels, and pagination is applied
+            # locally, so every page of a query (and its export) shares one fetch.
+            origin_label = _port_label(origin_port)
+            destination_label = _port_label(destination_port)
+            cache_key = (tuple(sorted(params.items())), origin_label, destination_label)
+            current_time = time.monotonic()
+            schedules = self._cache_get(
+                self._itinerary_cache, cache_key, current_time, ITINERARY_CACHE_TTL_SECONDS
+            )
+            if schedules is None:
+                try:
+                    # Only the decoded tree is kept; the raw body is released before mapping
+                    data = orjson.loads(
+                        self._make_request("/itinerary/v2/execution", params=params).content
+                    )
+                except SearoutesAPIError as e:
+                    # Handle graceful no-results for error 1110 "no itinerary found"
+                    if self._is_no_results_error(e):
+                        # Return empty results with HTTP 200, no 4xx in our API
+                        return [], Page(total=0, page=page.page, pageSize=page.pageSize)
+                    else:
+                        # Re-raise other API errors
+                        raise
 
-            # 6) Apply pagination
-            total = len(sorted_schedules)
+                schedules = self._map_itineraries_to_schedules(
+                    data, origin_label, destination_label
+                )
+                self._cache_put(
+                    self._itinerary_cache,
+                    cache_key,
+                    schedules,
+                    current_time,
+                    ITINERARY_CACHE_MAX_ENTRIES,
+                )
+
+            # 5) Apply client-side filtering and sorting; only the schedules up to the
+            # end of the requested page need to be put in order
+            filtered_schedules = self._apply_filters(schedules, flt)
             start_idx = (page.page - 1) * page.pageSize
             end_idx = start_idx + page.pageSize
+            sorted_schedules = self._apply_sorting(
+                filtered_schedules, flt.sort or "etd", limit=end_idx
+            )
+
+            # 6) Apply pagination
+            total = len(filtered_schedules)
             paginated_schedules = sorted_schedules[start_idx:end_idx]
 
             return paginated_schedules, Page(total=total, page=page.page, pageSize=page.pageSize)
@@ -702,13 +1188,17 @@ class SearoutesProvider(ScheduleProvider):
             # Re-raise Searoutes-specific errors to be handled by the API layer
             raise
         except Exception as e:
-            # Wrap other exceptions as generic Searoutes errors
-            raise SearoutesError(f"Unexpected error: {str(e)}")
+            # Wrap other exceptions as generic Searoutes errors, keeping the cause
+            raise SearoutesError(f"Unexpected error: {e}") from e
 
     def _map_itineraries_to_schedules(
-        self, data: dict, origin_port: Optional[Dict], destination_port: Optional[Dict]
+        self, data: dict, origin_label: Optional[str], destination_label: Optional[str]
     ) -> List[Schedule]:
-        """Map Searoutes itinerary response to internal Schedule format."""
+        """Map Searoutes itinerary response to internal Schedule format.
+
+        origin_label/destination_label are the "Name, CC" strings of the resolved
+        ports, built once per list() call and shared by every itinerary.
+        """
         schedules = []
 
         # Handle various response formats
@@ -724,18 +1214,18 @@ class SearoutesProvider(ScheduleProvider):
 
         for itinerary in itineraries:
             try:
-                schedule = self._map_single_itinerary(itinerary, origin_port, destination_port)
+                schedule = self._map_single_itinerary(itinerary, origin_label, destination_label)
                 if schedule:
                     schedules.append(schedule)
             except Exception as e:
                 # Skip invalid itineraries but continue processing others
-                print(f"Error mapping itinerary: {e}")
+                logger.debug("Error mapping itinerary: %s", e)
                 continue
 
         return schedules
 
     def _map_single_itinerary(
-        self, itinerary: dict, origin_port: Optional[Dict], destination_port: Optional[Dict]
+        self, itinerary: dict, origin_label: Optional[str], destination_label: Optional[str]
     ) -> Optional[Schedule]:
         """Map a single itinerary to Schedule format."""
         # Extract legs from various possible locations
@@ -751,9 +1241,9 @@ class SearoutesProvider(ScheduleProvider):
         last_leg = legs_data[-1]
 
         # Get ETD from first leg departure
-        etd = first_leg.get("departure") or first_leg.get("etd") or first_leg.get("departureTime")
+        etd = _leg_etd(first_leg)
         # Get ETA from last leg arrival
-        eta = last_leg.get("arrival") or last_leg.get("eta") or last_leg.get("arrivalTime")
+        eta = _leg_eta(last_leg)
 
         if not etd or not eta:
             return None
@@ -764,12 +1254,7 @@ class SearoutesProvider(ScheduleProvider):
         # Calculate transit days if not provided
         transit_days = itinerary.get("transitDays")
         if not transit_days:
-            try:
-                etd_dt = datetime.fromisoformat(etd.replace("Z", "+00:00"))
-                eta_dt = datetime.fromisoformat(eta.replace("Z", "+00:00"))
-                transit_days = ceil((eta_dt - etd_dt).total_seconds() / 86400)
-            except:
-                transit_days = 0
+            transit_days = _transit_days(etd, eta)
 
         # Extract vessel, voyage, carrier info (prefer from first leg)
         vessel = (
@@ -791,50 +1276,17 @@ class SearoutesProvider(ScheduleProvider):
         service = itinerary.get("service") or itinerary.get("serviceName")
 
         # Build origin/destination strings
-        origin = ""
-        destination = ""
-
-        if origin_port:
-            origin = f"{origin_port['name']}, {origin_port['country']}"
-        elif first_leg.get("fromPort"):
-            origin = first_leg["fromPort"]
-
-        if destination_port:
-            destination = f"{destination_port['name']}, {destination_port['country']}"
-        elif last_leg.get("toPort"):
-            destination = last_leg["toPort"]
+        origin = origin_label or first_leg.get("fromPort") or ""
+        destination = destination_label or last_leg.get("toPort") or ""
 
         # Map legs for detailed view
         mapped_legs = []
-        for i, leg in enumerate(legs_data):
+        # Per-leg detail is only exposed for multi-leg routes, so direct ones skip it
+        for i, leg in enumerate(legs_data if len(legs_data) > 1 else ()):
             try:
-                leg_etd = leg.get("departure") or leg.get("etd") or leg.get("departureTime") or ""
-                leg_eta = leg.get("arrival") or leg.get("eta") or leg.get("arrivalTime") or ""
-                leg_transit = leg.get("transitDays", 0)
-
-                if not leg_transit and leg_etd and leg_eta:
-                    try:
-                        leg_etd_dt = datetime.fromisoformat(leg_etd.replace("Z", "+00:00"))
-                        leg_eta_dt = datetime.fromisoformat(leg_eta.replace("Z", "+00:00"))
-                        leg_transit = ceil((leg_eta_dt - leg_etd_dt).total_seconds() / 86400)
-                    except:
-                        leg_transit = 0
-
-                schedule_leg = ScheduleLeg(
-                    legNumber=i + 1,
-                    fromLocode=leg.get("fromLocode") or leg.get("originLocode") or "",
-                    fromPort=leg.get("fromPort") or leg.get("originPort") or "",
-                    toLocode=leg.get("toLocode") or leg.get("destinationLocode") or "",
-                    toPort=leg.get("toPort") or leg.get("destinationPort") or "",
-                    etd=leg_etd,
-                    eta=leg_eta,
-                    vessel=leg.get("vessel") or leg.get("vesselName") or vessel,
-                    voyage=leg.get("voyage") or leg.get("voyageNumber") or voyage,
-                    transitDays=leg_transit,
-                )
-                mapped_legs.append(schedule_leg)
+                mapped_legs.append(_map_leg(leg, i + 1, vessel, voyage))
             except Exception as e:
-                print(f"Error mapping leg {i}: {e}")
+                logger.debug("Error mapping leg %d: %s", i, e)
                 continue
 
         # Extract hash for CO2 details lookup (Task 23)
@@ -873,9 +1325,18 @@ class SearoutesProvider(ScheduleProvider):
 
         return filtered
 
-    def _apply_sorting(self, schedules: List[Schedule], sort_field: str) -> List[Schedule]:
-        """Apply sorting to schedules."""
-        if sort_field == "transit":
-            return sorted(schedules, key=lambda s: s.transitDays)
-        else:  # default to ETD
-            return sorted(schedules, key=lambda s: s.etd)
+    def _apply_sorting(
+        self, schedules: List[Schedule], sort_field: str, limit: Optional[int] = None
+    ) -> List[Schedule]:
+        """Apply sorting to schedules, keeping only the first `limit` if given.
+
+        ETDs are ordered by the instant they encode (see _etd_epoch), reusing the
+        timestamps already parsed for transit days. A limit below the input size
+        selects with a bounded heap instead of sorting everything; ties keep their
+        input order either way.
+        """
+        # default to ETD
+        key = _TRANSIT_KEY if sort_field == "transit" else _etd_sort_key
+        if limit is not None and limit < len(schedules):
+            return heapq.nsmallest(limit, schedules, key=key)
+        return sorted(schedules, key=key)
@@ -1,75 +1,134 @@
-import json
+import heapq
 import os
+from bisect import bisect_right
 from functools import lru_cache
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Tuple
 
+import orjson
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 
 router = APIRouter()
 
+_SCORE_KEY = itemgetter(0)
 
-# Cache the carriers data in memory
-@lru_cache(maxsize=1)
-def load_carriers_data() -> List[Dict[str, Any]]:
-    """Load carriers data from JSON file, cached in memory."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    carriers_file = os.path.join(current_dir, "../../../data/carriers.json")
+# Separates names in the joined search text; never part of a carrier name
+_NAME_SEP = "\0"
 
-    with open(carriers_file, "r", encoding="utf-8") as f:
-        return json.load(f)
 
+class _CarrierIndex(NamedTuple):
+    """Carriers plus pre-lowercased fields for search_carriers."""
 
-def score_carrier(carrier: Dict[str, Any], query: str) -> int:
-    """
-    Score a carrier based on query match relevance.
-    Higher score = better match.
+    carriers: List[Dict[str, Any]]
+    scac_exact: Dict[str, Tuple[int, ...]]  # lowercased SCAC -> positions in carriers
+    name_exact: Dict[str, Tuple[int, ...]]  # lowercased name -> positions in carriers
+    scac_lower: List[str]  # aligned with carriers
+    name_lower: List[str]
+    # All lowercased names joined by _NAME_SEP, and the offset each name starts at
+    name_text: str
+    name_starts: List[int]
 
-    Scoring priority:
-    1. Exact SCAC match: 1000
-    2. Exact name match: 900
-    3. Partial name match: 800
-    4. Partial SCAC match: 700
+
+def _positions(values: List[str]) -> Dict[str, Tuple[int, ...]]:
+    positions: Dict[str, List[int]] = {}
+    for i, value in enumerate(values):
+        positions.setdefault(value, []).append(i)
+    return {k: tuple(v) for k, v in positions.items()}
+
+
+def _name_matches(index: _CarrierIndex, query_lower: str) -> set:
+    """Positions of carriers whose lowercased name contains query_lower.
+
+    Scans the joined name text with str.find, so the substring search runs in C
+    over one string rather than once per carrier; after a hit it skips straight
+    to the next name.
     """
-    query_lower = query.lower().strip()
+    if _NAME_SEP in query_lower:
+        return set()
+    text, starts = index.name_text, index.name_starts
+    matches = set()
+    pos = text.find(query_lower)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        matches.add(i)
+        if i + 1 == len(starts):
+            break
+        pos = text.find(query_lower, starts[i + 1])
+    return matches
 
-    # Exact SCAC match (highest priority)
-    if carrier["scac"].lower() == query_lower:
-        return 1000
 
-    # Exact name match
-    if carrier["name"].lower() == query_lower:
-        return 900
+# Cache the carriers data in memory
+@lru_cache(maxsize=1)
+def load_carriers_data() -> _CarrierIndex:
+    """Load carriers data from JSON file and index it, cached in memory."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    carriers_file = os.path.join(current_dir, "../../../data/carriers.json")
+
+    with open(carriers_file, "rb") as f:
+        carriers = orjson.loads(f.read())
+
+    scac_lower = [carrier["scac"].lower() for carrier in carriers]
+    name_lower = [carrier["name"].lower() for carrier in carriers]
+    name_starts = []
+    offset = 0
+    for name in name_lower:
+        name_starts.append(offset)
+        offset += len(name) + len(_NAME_SEP)
+    return _CarrierIndex(
+        carriers=carriers,
+        scac_exact=_positions(scac_lower),
+        name_exact=_positions(name_lower),
+        scac_lower=scac_lower,
+        name_lower=name_lower,
+        name_text=_NAME_SEP.join(name_lower),
+        name_starts=name_starts,
+    )
+
+
+@lru_cache(maxsize=2048)
+def _search_cached(query_lower: str, limit: int) -> Tuple[Dict[str, Any], ...]:
+    """Ranked carriers for a normalized query, memoized.
+
+    Results depend only on (query, limit) and the carriers file, which is loaded
+    once per process, so autocomplete keystrokes repeated across users are served
+    from the cache. Call _search_cached.cache_clear() if the data is ever reloaded.
+    """
+    index = load_carriers_data()
 
-    # Partial name match
-    if query_lower in carrier["name"].lower():
-        return 800
+    # Exact matches come straight from the lookup tables; SCAC outranks name
+    exact = dict.fromkeys(index.name_exact.get(query_lower, ()), 900)
+    exact.update(dict.fromkeys(index.scac_exact.get(query_lower, ()), 1000))
+    name_matches = _name_matches(index, query_lower)
 
-    # Partial SCAC match
-    if query_lower in carrier["scac"].lower():
-        return 700
+    def scored_carriers():
+        # Score and filter carriers; SCACs are a few characters, so a plain scan is fine there
+        for i, scac in enumerate(index.scac_lower):
+            if i in exact:
+                yield exact[i], index.carriers[i]
+            elif i in name_matches:
+                yield 800, index.carriers[i]
+            elif query_lower in scac:
+                yield 700, index.carriers[i]
 
-    # No match
-    return 0
+    # Top `limit` by score without sorting every match; nlargest keeps file order on ties
+    top = heapq.nlargest(limit, scored_carriers(), key=_SCORE_KEY)
+    return tuple(carrier for _, carrier in top)
 
 
 @router.get("/api/carriers/search")
 def search_carriers(
     q: str = Query(..., description="Search query"),
     limit: int = Query(15, description="Maximum number of results", ge=1, le=100),
-) -> List[Dict[str, Any]]:
+) -> ORJSONResponse:
     """
     Search carriers by name or SCAC code.
     Returns results ordered by relevance.
+
+    Scoring priority:
+    1. Exact SCAC match: 1000
+    2. Exact name match: 900
+    3. Partial name match: 800
+    4. Partial SCAC match: 700
     """
-    carriers = load_carriers_data()
-
-    # Score and filter carriers
-    scored_carriers = []
-    for carrier in carriers:
-        score = score_carrier(carrier, q)
-        if score > 0:  # Only include matches
-            scored_carriers.append((score, carrier))
-
-    # Sort by score (descending) and limit results
-    scored_carriers.sort(key=lambda x: x[0], reverse=True)
-    return [carrier for _, carrier in scored_carriers[:limit]]
+    return ORJSONResponse(list(_search_cached(q.lower().strip(), limit)))
@@ -1,27 +1,126 @@
-import json
+import heapq
 import os
+from bisect import bisect_right
 from functools import lru_cache
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Set, Tuple
 
+import orjson
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 
 router = APIRouter()
 
+_SCORE_KEY = itemgetter(0)
+
+# Separates entries in the joined search texts; never part of a port field
+_TEXT_SEP = "\0"
+
+
+class _SearchText(NamedTuple):
+    """Lowercased strings joined by _TEXT_SEP, and the offset each one starts at."""
+
+    text: str
+    starts: List[int]
+
+
+class _PortIndex(NamedTuple):
+    """Ports plus lookup tables for search_ports, all keyed on lowercased fields."""
+
+    ports: List[Dict[str, Any]]
+    locode_exact: Dict[str, Tuple[int, ...]]  # lowercased value -> positions in ports
+    name_exact: Dict[str, Tuple[int, ...]]
+    country_exact: Dict[str, Tuple[int, ...]]
+    country_name_exact: Dict[str, Tuple[int, ...]]
+    names: _SearchText  # one entry per port
+    # One entry per distinct country name, in country_name_exact order
+    country_names: _SearchText
+    country_name_ports: List[Tuple[int, ...]]  # aligned with country_names entries
+    aliases: _SearchText  # one entry per alias, ports in order and aliases in order
+    alias_lower: List[str]  # aligned with aliases entries
+    alias_port: List[int]  # aligned with aliases entries: position of the owning port
+
+
+def _positions(values: List[str]) -> Dict[str, Tuple[int, ...]]:
+    positions: Dict[str, List[int]] = {}
+    for i, value in enumerate(values):
+        positions.setdefault(value, []).append(i)
+    return {k: tuple(v) for k, v in positions.items()}
+
+
+def _search_text(values: List[str]) -> _SearchText:
+    starts = []
+    offset = 0
+    for value in values:
+        starts.append(offset)
+        offset += len(value) + len(_TEXT_SEP)
+    return _SearchText(_TEXT_SEP.join(values), starts)
+
+
+def _text_matches(search: _SearchText, query_lower: str) -> Set[int]:
+    """Entries of a _SearchText that contain query_lower.
+
+    Scans the joined text with str.find, so the substring search runs in C over
+    one string rather than once per entry; after a hit it skips to the next entry.
+    """
+    if _TEXT_SEP in query_lower:
+        return set()
+    text, starts = search
+    matches = set()
+    pos = text.find(query_lower)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        matches.add(i)
+        if i + 1 == len(starts):
+            break
+        pos = text.find(query_lower, starts[i + 1])
+    return matches
+
+
+def _index_ports(ports: List[Dict[str, Any]]) -> _PortIndex:
+    """Lay ports out column-wise: every searched field is lowercased once, here."""
+    name_lower = [port["name"].lower() for port in ports]
+    # Many ports share a country, so partial country-name matching scans each
+    # distinct name once and fans out to its ports
+    country_name_lower = [port.get("countryName", "").lower() for port in ports]
+    country_name_exact = _positions(country_name_lower)
+    alias_lower = []
+    alias_port = []
+    for i, port in enumerate(ports):
+        for alias in port.get("aliases", []):
+            alias_lower.append(alias.lower())
+            alias_port.append(i)
+
+    return _PortIndex(
+        ports=ports,
+        locode_exact=_positions([port["locode"].lower() for port in ports]),
+        name_exact=_positions(name_lower),
+        country_exact=_positions([port["country"].lower() for port in ports]),
+        country_name_exact=country_name_exact,
+        names=_search_text(name_lower),
+        country_names=_search_text(list(country_name_exact)),
+        country_name_ports=list(country_name_exact.values()),
+        aliases=_search_text(alias_lower),
+        alias_lower=alias_lower,
+        alias_port=alias_port,
+    )
+
 
 # Cache the ports data in memory
 @lru_cache(maxsize=1)
-def load_ports_data() -> List[Dict[str, Any]]:
-    """Load ports data from JSON file, cached in memory."""
+def load_ports_data() -> _PortIndex:
+    """Load ports data from JSON file and index it, cached in memory."""
     current_dir = os.path.dirname(os.path.abspath(__file__))
     ports_file = os.path.join(current_dir, "../../../data/ports.json")
 
-    with open(ports_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(ports_file, "rb") as f:
+        return _index_ports(orjson.loads(f.read()))
 
 
-def score_port(port: Dict[str, Any], query: str) -> int:
+def score_ports(index: _PortIndex, query_lower: str) -> Dict[int, int]:
     """
-    Score a port based on query match relevance.
+    Score ports against an already lowercased and stripped query.
+    Returns {position in index.ports: score} for matching ports only.
     Higher score = better match.
 
     Scoring priority:
@@ -32,64 +131,67 @@ def score_port(port: Dict[str, Any], query: str) -> int:
     5. Partial alias match: 600
     6. Country code match: 500
     7. Country name match: 400
-    """
-    query_lower = query.lower().strip()
-
-    # Exact LOCODE match (highest priority)
-    if port["locode"].lower() == query_lower:
-        return 1000
+    8. Partial country name match: 300
 
-    # Exact name match
-    if port["name"].lower() == query_lower:
-        return 900
-
-    # Partial name match
-    if query_lower in port["name"].lower():
-        return 800
-
-    # Check aliases
-    for alias in port.get("aliases", []):
-        # Exact alias match
-        if alias.lower() == query_lower:
-            return 700
-        # Partial alias match
-        if query_lower in alias.lower():
-            return 600
-
-    # Country code match
-    if port["country"].lower() == query_lower:
-        return 500
-
-    # Country name match
-    if port.get("countryName", "").lower() == query_lower:
-        return 400
+    Only a port's first alias containing the query counts, so a partial hit on
+    an earlier alias scores 600 even if a later alias matches exactly.
+    """
+    scores: Dict[int, int] = {}
+
+    # Tiers are applied lowest first, so a port ends up with its best score
+    for entry in _text_matches(index.country_names, query_lower):
+        for i in index.country_name_ports[entry]:
+            scores[i] = 300
+    for i in index.country_name_exact.get(query_lower, ()):
+        scores[i] = 400
+    for i in index.country_exact.get(query_lower, ()):
+        scores[i] = 500
+
+    # Alias entries are ordered port by port, so the lowest entry per port is its
+    # first matching alias
+    first_alias: Dict[int, int] = {}
+    for entry in sorted(_text_matches(index.aliases, query_lower)):
+        first_alias.setdefault(index.alias_port[entry], entry)
+    for i, entry in first_alias.items():
+        scores[i] = 700 if index.alias_lower[entry] == query_lower else 600
+
+    for i in _text_matches(index.names, query_lower):
+        scores[i] = 800
+    for i in index.name_exact.get(query_lower, ()):
+        scores[i] = 900
+    for i in index.locode_exact.get(query_lower, ()):
+        scores[i] = 1000
+
+    return scores
+
+
+@lru_cache(maxsize=4096)
+def _search_ports_cached(query_lower: str, limit: int) -> Tuple[Dict[str, Any], ...]:
+    """Ranked ports for a normalized query, memoized.
+
+    Results depend only on (query, limit) and the ports file, which is loaded once
+    per process, so repeated typeahead prefixes are served from the cache. Call
+    _search_ports_cached.cache_clear() if the data is ever reloaded. The tuple holds
+    the index's own port dicts, shared by every caller: serialize them, never mutate.
+    """
+    index = load_ports_data()
 
-    # Partial country name match
-    if query_lower in port.get("countryName", "").lower():
-        return 300
+    # Score and filter ports; feeding them in file order keeps ties in file order
+    scores = score_ports(index, query_lower)
+    scored_ports = ((scores[i], index.ports[i]) for i in sorted(scores))
 
-    # No match
-    return 0
+    # Top `limit` by score without sorting every match
+    top = heapq.nlargest(limit, scored_ports, key=_SCORE_KEY)
+    return tuple(port for _, port in top)
 
 
 @router.get("/api/ports/search")
 def search_ports(
     q: str = Query(..., description="Search query"),
     limit: int = Query(15, description="Maximum number of results", ge=1, le=100),
-) -> List[Dict[str, Any]]:
+) -> ORJSONResponse:
     """
     Search ports by name, locode, aliases, country code, or country name.
     Returns results ordered by relevance.
     """
-    ports = load_ports_data()
-
-    # Score and filter ports
-    scored_ports = []
-    for port in ports:
-        score = score_port(port, q)
-        if score > 0:  # Only include matches
-            scored_ports.append((score, port))
-
-    # Sort by score (descending) and limit results
-    scored_ports.sort(key=lambda x: x[0], reverse=True)
-    return [port for _, port in scored_ports[:limit]]
+    return ORJSONResponse(list(_search_ports_cached(q.lower().strip(), limit)))
@@ -1,14 +1,16 @@
 import csv
 import io
-import re
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
+
+import orjson
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+from fastapi.responses import Response, StreamingResponse
 
+from ..models.schedule import SCHEDULE_LIST_ADAPTER, Schedule, ScheduleListResponse
 from ..providers.base import Page, ScheduleFilter, ScheduleProvider
 
 # Import exception classes for error handling
@@ -29,6 +31,13 @@ except ImportError:
 router = APIRouter()
 provider: ScheduleProvider = None  # Will be injected by main.py
 
+# Pages larger than this are streamed item by item instead of encoded in one buffer
+STREAM_THRESHOLD = 500
+# Schedules encoded per chunk of a streamed list response
+STREAM_BATCH_ITEMS = 100
+# Rows formatted per chunk of a streamed CSV export
+CSV_BATCH_ROWS = 500
+
 
 def set_provider(schedule_provider: ScheduleProvider):
     """Inject the schedule provider instance."""
@@ -36,12 +45,56 @@ def set_provider(schedule_provider: ScheduleProvider):
     provider = schedule_provider
 
 
+def provider_error(e: SearoutesError) -> HTTPException:
+    """Map a provider failure to the HTTP error the schedule endpoints report."""
+    if isinstance(e, SearoutesRateLimitError):
+        return HTTPException(status_code=429, detail=e.to_dict())
+    if isinstance(e, SearoutesAPIError):
+        # Map to appropriate HTTP status or default to 502 for upstream errors
+        status_code = 502 if e.code and "HTTP_5" in e.code else 400
+        return HTTPException(status_code=status_code, detail=e.to_dict())
+    return HTTPException(status_code=502, detail=e.to_dict())
+
+
+def _primed_schedules(filt: ScheduleFilter) -> Iterator[Schedule]:
+    """provider.iter(filt) with its first schedule already fetched.
+
+    Exports call this before starting a response or a workbook, so lookup and
+    upstream failures are raised here as provider_error, like list_schedules does.
+    """
+    items = provider.iter(filt)
+    try:
+        first = next(items, None)
+    except SearoutesError as e:
+        raise provider_error(e)
+    return items if first is None else chain((first,), items)
+
+
+@lru_cache(maxsize=1024)
 def normalize_locode_scac(value: Optional[str]) -> Optional[str]:
-    """Normalize LOCODE/SCAC: uppercase, strip spaces/hyphens."""
+    """Normalize LOCODE/SCAC: uppercase, strip spaces/hyphens.
+
+    Memoized, since the same origin/destination/carrier values recur across requests.
+    """
     if not value:
         return value
-    # Strip spaces and hyphens, then uppercase
-    return re.sub(r"[\s\-]", "", value).upper()
+    # Strip hyphens and whitespace (str.split() drops the same characters as \s), then uppercase
+    return "".join(value.replace("-", "").split()).upper()
+
+
+@lru_cache(maxsize=1024)
+def _is_iso_date(date_str: str) -> bool:
+    """Whether date_str parses as ISO-8601 the way the providers will parse it.
+
+    A full parse, not a shape regex, so impossible dates like 2025-02-30 are
+    rejected here rather than failing later in a provider. Memoized because
+    paging through results repeats the same from/to values.
+    """
+    try:
+        datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
 
 
 def validate_iso_date(date_str: Optional[str], field_name: str) -> Optional[str]:
@@ -49,45 +102,158 @@ def validate_iso_date(date_str: Optional[str], field_name: str) -> Optional[str]
     if not date_str:
         return date_str
 
-    try:
-        # Try to parse as ISO-8601 date
-        datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        return date_str
-    except ValueError:
+    if not _is_iso_date(date_str):
         raise HTTPException(
             status_code=400,
             detail=f"Invalid date format for '{field_name}'. Expected ISO-8601 format (e.g., '2025-08-20' or '2025-08-20T12:00:00').",
         )
-
-
+    return date_str
+
+
+# Full location names -> UN/LOCODEs for the exports
+_LOCODE_MAP = {
+    "Alexandria, EG": "EGALY",
+    "Tanger, MA": "MATNG",
+    "Rotterdam, NL": "NLRTM",
+    "Damietta, EG": "EGDAM",
+    "Valencia, ES": "ESVLC",
+    "Port Said, EG": "EGPSD",
+    "Barcelona, ES": "ESBCN",
+    "Hamburg, DE": "DEHAM",
+    "Le Havre, FR": "FRLEH",
+    "Genoa, IT": "ITGOA",
+    "Piraeus, GR": "GRPIR",
+    "Antwerp, BE": "BEANR",
+    "Singapore, SG": "SGSIN",
+    "Dubai, AE": "AEDXB",
+    "Jeddah, SA": "SAJED",
+    # Add more mappings as needed
+}
+
+
+@lru_cache(maxsize=2048)
 def extract_locode(location: str) -> str:
     """
     Extract LOCODE from location string.
     Maps full location names to UN/LOCODEs for CSV export.
+
+    Memoized: an export repeats the same few origins/destinations on every row.
+    """
+    return _LOCODE_MAP.get(location) or location.split(",", 1)[0][:5].upper()
+
+
+def _envelope_tail(meta: Page) -> bytes:
+    """The '],"total":...,"page":...,"pageSize":...}' end of the list envelope."""
+    tail = {"total": meta.total, "page": meta.page, "pageSize": meta.pageSize}
+    return b"]," + orjson.dumps(tail)[1:]
+
+
+def stream_schedules(items: List[Schedule], meta: Page) -> Iterator[bytes]:
+    """Yield the schedules envelope as JSON chunks, a batch of schedules at a time.
+
+    Keeps memory flat for very large pages and lets the first bytes go out
+    before the last schedule is serialized. Each batch is encoded to JSON bytes
+    by pydantic-core directly, without building intermediate dicts.
+    """
+    yield b'{"items":['
+    for start in range(0, len(items), STREAM_BATCH_ITEMS):
+        batch = SCHEDULE_LIST_ADAPTER.dump_json(items[start : start + STREAM_BATCH_ITEMS])
+        yield (b"," if start else b"") + batch[1:-1]
+    yield _envelope_tail(meta)
+
+
+# Column order shared by the CSV and xlsx exports, as specified
+EXPORT_COLUMNS = (
+    "originLocode",
+    "destinationLocode",
+    "etd",
+    "eta",
+    "vessel",
+    "voyage",
+    "carrier",
+    "routingType",
+    "transitDays",
+    "service",
+)
+
+
+# xlsx column widths (characters), aligned with EXPORT_COLUMNS: wide enough for the
+# header and for a typical value (timestamps are 20 characters)
+XLSX_COLUMN_WIDTHS = (14, 19, 22, 22, 24, 12, 16, 15, 13, 16)
+
+
+def export_row(item: Schedule) -> list:
+    """One export row, in EXPORT_COLUMNS order."""
+    return [
+        extract_locode(item.origin),
+        extract_locode(item.destination),
+        item.etd,
+        item.eta,
+        item.vessel,
+        item.voyage,
+        item.carrier,
+        item.routingType,
+        item.transitDays,
+        item.service or "",  # Handle None values
+    ]
+
+
+def _plain_csv(rows: List[list]) -> Optional[str]:
+    """Format export rows as CSV without the csv module, if none needs quoting.
+
+    Rows are formatted with one f-string each, and the batch is checked as a whole.
+    Every row adds exactly 9 commas and one CRLF, so any extra comma, CR or LF
+    (or any double quote) means some field needed quoting, and None is returned
+    for csv.writer to handle the batch. Otherwise the text is what csv.writer
+    would produce. csv.writer writes None as an empty field where an f-string
+    would write "None", so a batch with a None field goes to csv.writer too.
     """
-    locode_map = {
-        "Alexandria, EG": "EGALY",
-        "Tanger, MA": "MATNG",
-        "Rotterdam, NL": "NLRTM",
-        "Damietta, EG": "EGDAM",
-        "Valencia, ES": "ESVLC",
-        "Port Said, EG": "EGPSD",
-        "Barcelona, ES": "ESBCN",
-        "Hamburg, DE": "DEHAM",
-        "Le Havre, FR": "FRLEH",
-        "Genoa, IT": "ITGOA",
-        "Piraeus, GR": "GRPIR",
-        "Antwerp, BE": "BEANR",
-        "Singapore, SG": "SGSIN",
-        "Dubai, AE": "AEDXB",
-        "Jeddah, SA": "SAJED",
-        # Add more mappings as needed
-    }
-
-    return locode_map.get(location, location.split(",")[0][:5].upper())
-
-
-@router.get("/api/schedules")
+    if any(None in row for row in rows):
+        return None
+    text = "".join(
+        [
+            f"{a},{b},{etd},{eta},{vessel},{voyage},{carrier},{routing},{days},{service}\r\n"
+            for a, b, etd, eta, vessel, voyage, carrier, routing, days, service in rows
+        ]
+    )
+    n = len(rows)
+    if '"' in text or text.count(",") != 9 * n or text.count("\n") != n or text.count("\r") != n:
+        return None
+    return text
+
+
+def iter_schedules_csv(items: Iterable[Schedule]) -> Iterator[str]:
+    """Yield the CSV export a batch of rows at a time.
+
+    Only one batch is formatted and held at once, and the client starts receiving
+    the file before the last row is written. items is consumed lazily, so it can
+    be a provider's iter(): the header goes out on its own first, and the client
+    has it while the provider is still fetching the rows. The CSV export primes
+    items with _primed_schedules, so a failing first read is still an error status.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Write header row with exact column order from spec, sent before any row is read
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    # Write data rows
+    rows = map(export_row, items)
+    while batch := list(islice(rows, CSV_BATCH_ROWS)):
+        text = _plain_csv(batch)
+        if text is None:
+            writer.writerows(batch)
+        else:
+            buffer.write(text)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@router.get("/api/schedules", responses={200: {"model": ScheduleListResponse}})
 def list_schedules(
     origin: Optional[str] = None,
     destination: Optional[str] = None,
@@ -149,22 +315,17 @@ def list_schedules(
 
     try:
         items, meta = provider.list(filt, page_params)
-    except SearoutesRateLimitError as e:
-        raise HTTPException(status_code=429, detail=e.to_dict())
-    except SearoutesAPIError as e:
-        # Map to appropriate HTTP status or default to 502 for upstream errors
-        status_code = 502 if e.code and "HTTP_5" in e.code else 400
-        raise HTTPException(status_code=status_code, detail=e.to_dict())
     except SearoutesError as e:
-        raise HTTPException(status_code=502, detail=e.to_dict())
+        raise provider_error(e)
+
+    if len(items) > STREAM_THRESHOLD:
+        return StreamingResponse(stream_schedules(items, meta), media_type="application/json")
 
-    # Return the exact envelope format specified in the contract
-    return {
-        "items": [item.model_dump() for item in items],
-        "total": meta.total,
-        "page": meta.page,
-        "pageSize": meta.pageSize,
-    }
+    # Return the exact envelope format specified in the contract. The items are
+    # encoded to JSON bytes by pydantic-core in one call (no intermediate dicts),
+    # and returning the response directly skips FastAPI's jsonable_encoder pass.
+    body = b'{"items":' + SCHEDULE_LIST_ADAPTER.dump_json(items)[:-1] + _envelope_tail(meta)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/api/schedules.csv")
@@ -199,53 +360,16 @@ def export_schedules_csv(
         sort=sort,
     )
 
-    # Get ALL results (ignore pagination for exports)
-    page_params = Page(page=1, pageSize=10000)  # Large page size to get all results
-    items, meta = provider.list(filt, page_params)
-
-    # Create CSV content
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header row with exact column order from spec
-    writer.writerow(
-        [
-            "originLocode",
-            "destinationLocode",
-            "etd",
-            "eta",
-            "vessel",
-            "voyage",
-            "carrier",
-            "routingType",
-            "transitDays",
-            "service",
-        ]
-    )
+    # Stream ALL results (ignore pagination for exports) out in batches of rows;
+    # the provider is read as the file is written. StreamingResponse pulls this sync
+    # generator in the threadpool without blocking the event loop.
+    # The 200 goes out before the generator runs, so the first schedule is pulled
+    # here: lookup and upstream failures then get an error status instead of an
+    # empty file that looks like a success
+    items = _primed_schedules(filt)
 
-    # Write data rows
-    for item in items:
-        writer.writerow(
-            [
-                extract_locode(item.origin),
-                extract_locode(item.destination),
-                item.etd,
-                item.eta,
-                item.vessel,
-                item.voyage,
-                item.carrier,
-                item.routingType,
-                item.transitDays,
-                item.service or "",  # Handle None values
-            ]
-        )
-
-    csv_content = output.getvalue()
-    output.close()
-
-    # Return CSV with proper headers
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        iter_schedules_csv(items),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=schedules.csv"},
     )
@@ -283,50 +407,30 @@ def export_schedules_xlsx(
         sort=sort,
     )
 
-    # Get ALL results (ignore pagination for exports)
-    page_params = Page(page=1, pageSize=10000)  # Large page size to get all results
-    items, meta = provider.list(filt, page_params)
-
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Schedules"
-
-    # Define headers with exact column order from spec
-    headers = [
-        "originLocode",
-        "destinationLocode",
-        "etd",
-        "eta",
-        "vessel",
-        "voyage",
-        "carrier",
-        "routingType",
-        "transitDays",
-        "service",
-    ]
+    # Fetched before the workbook exists, so a provider failure leaves no half-written
+    # sheet behind
+    items = _primed_schedules(filt)
 
-    # Write header row
-    for col_idx, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col_idx, value=header)
+    # openpyxl is only needed here and is slow to import, so it is loaded on the
+    # first xlsx export rather than at startup
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
 
-    # Write data rows
-    for row_idx, item in enumerate(items, 2):  # Start from row 2 (after header)
-        ws.cell(row=row_idx, column=1, value=extract_locode(item.origin))
-        ws.cell(row=row_idx, column=2, value=extract_locode(item.destination))
-        ws.cell(row=row_idx, column=3, value=item.etd)
-        ws.cell(row=row_idx, column=4, value=item.eta)
-        ws.cell(row=row_idx, column=5, value=item.vessel)
-        ws.cell(row=row_idx, column=6, value=item.voyage)
-        ws.cell(row=row_idx, column=7, value=item.carrier)
-        ws.cell(row=row_idx, column=8, value=item.routingType)
-        ws.cell(row=row_idx, column=9, value=item.transitDays)
-        ws.cell(row=row_idx, column=10, value=item.service or "")
-
-    # Auto-adjust column widths
-    for col_idx in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_idx)
-        ws.column_dimensions[column_letter].auto_size = True
+    # Write-only workbook: rows are serialized as they are appended instead of
+    # being kept as a grid of Cell objects until save
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Schedules")
+
+    # Fixed column widths; openpyxl can't auto-fit, and auto_size is ignored by Excel.
+    # Column settings must precede the first row in a write-only sheet
+    for col_idx, width in enumerate(XLSX_COLUMN_WIDTHS, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    # Write header row, then one append per data row for ALL results (ignore
+    # pagination for exports)
+    ws.append(EXPORT_COLUMNS)
+    for item in items:
+        ws.append(export_row(item))
 
     # Save to BytesIO buffer
     output = io.BytesIO()
@@ -367,21 +471,14 @@ def get_co2_details(hash: str):
     try:
         # Proxy request to Searoutes CO₂ API endpoint
         response = provider._make_request(f"/co2/v2/execution/{hash}")
-        co2_data = response.json()
-
-        return co2_data
-
+    except SearoutesRateLimitError as e:
+        raise HTTPException(status_code=429, detail=e.to_dict())
+    except SearoutesAPIError as e:
+        if e.status_code == 404:
+            raise HTTPException(status_code=404, detail=f"CO₂ details not found for hash: {hash}")
+        raise HTTPException(status_code=e.status_code, detail=f"Searoutes API error: {str(e)}")
     except Exception as e:
-        # Handle various error types from Searoutes API
-        if hasattr(e, "response") and e.response:
-            status_code = e.response.status_code
-            if status_code == 404:
-                raise HTTPException(
-                    status_code=404, detail=f"CO₂ details not found for hash: {hash}"
-                )
-            elif status_code >= 400:
-                raise HTTPException(
-                    status_code=status_code, detail=f"Searoutes API error: {str(e)}"
-                )
-
         raise HTTPException(status_code=500, detail=f"Error retrieving CO₂ details: {str(e)}")
+
+    # Searoutes already sent JSON; relay the bytes instead of decoding and re-encoding them
+    return Response(content=response.content, media_type="application/json")
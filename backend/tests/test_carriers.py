@@ -0,0 +1,66 @@
+"""Tests for the carrier search route."""
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+class TestCarrierSearch:
+    """Test carrier search ranking over the bundled carriers data."""
+
+    def _search(self, **params):
+        response = client.get("/api/carriers/search", params=params)
+        assert response.status_code == 200
+        return [carrier["scac"] for carrier in response.json()]
+
+    def test_exact_scac_match_ranks_first(self):
+        """Test that an exact SCAC hit outranks partial matches, in any case."""
+        assert self._search(q="maeu") == ["MAEU"]
+        assert self._search(q="MSCU")[0] == "MSCU"
+
+    def test_exact_name_beats_partial_name(self):
+        """Test that an exact name match ranks ahead of names merely containing the query."""
+        assert self._search(q="hmm") == ["HMMU"]
+        assert self._search(q="cosco") == ["COSU"]
+
+    def test_query_is_normalized_once(self):
+        """Test that surrounding whitespace and case in the query don't affect matching."""
+        assert self._search(q="  Maersk ") == ["MAEU"]
+        assert self._search(q=" hlcu") == ["HLCU"]
+
+    def test_partial_name_match_stays_within_one_name(self):
+        """Test that a name substring matches every name containing it, never across two."""
+        assert self._search(q="ng") == ["MSCU", "YMLU"]
+        # "lloyd" ends one name and "cma" starts the next one in the file
+        assert self._search(q="lloydcma") == []
+
+    def test_ties_keep_file_order(self):
+        """Test that equally scored matches come back in carriers-file order."""
+        # "u" only appears in SCACs, so every hit scores as a partial SCAC match
+        assert self._search(q="u") == [
+            "MSCU",
+            "HLCU",
+            "CMAU",
+            "COSU",
+            "HMMU",
+            "YMLU",
+            "MAEU",
+        ]
+
+    def test_limit_and_no_match(self):
+        """Test that limit caps results and unmatched queries return an empty list."""
+        assert len(self._search(q="u", limit=2)) == 2
+        assert self._search(q="zzzz") == []
+
+    def test_normalized_queries_share_a_cached_result(self):
+        """Test that queries differing only in case/whitespace hit the same cache entry."""
+        from backend.app.routes.carriers import _search_cached
+
+        _search_cached.cache_clear()
+        first = self._search(q="Hapag")
+        second = self._search(q=" hapag ")
+        assert first == second == ["HLCU"]
+        info = _search_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
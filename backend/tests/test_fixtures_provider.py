@@ -0,0 +1,133 @@
+"""Tests for the fixtures-backed schedule provider."""
+
+import json
+import os
+
+from backend.app.providers.base import Page, ScheduleFilter
+from backend.app.providers.fixtures import FixturesProvider
+
+SAMPLE = [
+    {
+        "id": "a",
+        "origin": "Alexandria, EG",
+        "destination": "Valencia, ES",
+        "etd": "2025-08-20T10:00:00Z",
+        "eta": "2025-08-25T10:00:00Z",
+        "vessel": "Vessel A",
+        "voyage": "V1",
+        "routingType": "Direct",
+        "transitDays": 5,
+        "carrier": "MSC",
+        "equipment": "40HC",
+    },
+    {
+        "id": "b",
+        "origin": "Damietta, EG",
+        "destination": "Rotterdam, NL",
+        "etd": "2025-08-18T10:00:00Z",
+        "eta": "2025-09-01T10:00:00Z",
+        "vessel": "Vessel B",
+        "voyage": "V2",
+        "routingType": "Transshipment",
+        "transitDays": 14,
+        "carrier": "Maersk",
+    },
+]
+
+
+def _provider(tmp_path, data=SAMPLE) -> FixturesProvider:
+    path = tmp_path / "schedules.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    provider = FixturesProvider()
+    provider.path = path
+    return provider
+
+
+class TestFixturesProviderLoading:
+    """Test fixture parsing and caching."""
+
+    def test_missing_optional_fields_default_to_none(self, tmp_path):
+        """Test that absent imo/service/equipment load as None."""
+        items, _ = _provider(tmp_path).list(ScheduleFilter(), Page())
+        maersk = next(x for x in items if x.id == "b")
+        assert maersk.imo is None
+        assert maersk.service is None
+        assert maersk.equipment is None
+
+    def test_load_is_cached_until_file_changes(self, tmp_path):
+        """Test that the parsed fixtures are reused until the file mtime changes."""
+        provider = _provider(tmp_path)
+        first, _ = provider.list(ScheduleFilter(), Page())
+        second, _ = provider.list(ScheduleFilter(), Page())
+        assert first[0] is second[0]
+
+        provider.path.write_text(json.dumps(SAMPLE[:1]), encoding="utf-8")
+        stat = provider.path.stat()
+        os.utime(provider.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        items, meta = provider.list(ScheduleFilter(), Page())
+        assert meta.total == 1
+        assert items[0].id == "a"
+
+
+class TestFixturesProviderFiltering:
+    """Test filtering and sorting over the cached fixtures."""
+
+    def test_exact_filters_are_case_insensitive_and_combine(self, tmp_path):
+        """Test routingType/equipment lookups match case-insensitively and intersect."""
+        provider = _provider(tmp_path)
+
+        items, _ = provider.list(ScheduleFilter(routingType="direct"), Page())
+        assert [x.id for x in items] == ["a"]
+
+        items, _ = provider.list(
+            ScheduleFilter(routingType="Direct", equipment="40hc"), Page()
+        )
+        assert [x.id for x in items] == ["a"]
+
+        items, meta = provider.list(
+            ScheduleFilter(routingType="Transshipment", equipment="40HC"), Page()
+        )
+        assert items == [] and meta.total == 0
+
+    def test_default_sort_is_etd_ascending(self, tmp_path):
+        """Test that results come back in ETD order regardless of file order."""
+        items, _ = _provider(tmp_path).list(ScheduleFilter(), Page())
+        assert [x.id for x in items] == ["b", "a"]
+
+    def test_transit_sort_keeps_file_order_for_ties(self, tmp_path):
+        """Test that schedules with equal transit times stay in file order, not ETD order."""
+        third = dict(SAMPLE[0], id="c", etd="2025-08-19T10:00:00Z")
+        provider = _provider(tmp_path, SAMPLE + [third])
+
+        items, _ = provider.list(ScheduleFilter(sort="transit"), Page())
+        assert [x.id for x in items] == ["a", "c", "b"]
+
+    def test_date_window_filters_on_etd(self, tmp_path):
+        """Test that from/to bound the ETD window inclusively."""
+        items, _ = _provider(tmp_path).list(
+            ScheduleFilter(
+                date_from="2025-08-19T00:00:00Z", date_to="2025-08-20T10:00:00Z"
+            ),
+            Page(),
+        )
+        assert [x.id for x in items] == ["a"]
+
+    def test_substring_filters_are_case_insensitive(self, tmp_path):
+        """Test that origin/destination/carrier match partial values in any case."""
+        provider = _provider(tmp_path)
+
+        items, _ = provider.list(ScheduleFilter(origin="ALEX", carrier="msc"), Page())
+        assert [x.id for x in items] == ["a"]
+
+        items, _ = provider.list(ScheduleFilter(destination="rotter"), Page())
+        assert [x.id for x in items] == ["b"]
+
+    def test_iter_yields_every_match_in_sort_order(self, tmp_path):
+        """Test that the default iter() walks all matches, not one page of them."""
+        provider = _provider(tmp_path)
+        assert [x.id for x in provider.iter(ScheduleFilter())] == ["b", "a"]
+        assert [x.id for x in provider.iter(ScheduleFilter(sort="transit"))] == [
+            "a",
+            "b",
+        ]
@@ -0,0 +1,100 @@
+"""Tests for the port search route."""
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+class TestPortSearch:
+    """Test port search ranking over the bundled ports data."""
+
+    def _search(self, **params):
+        response = client.get("/api/ports/search", params=params)
+        assert response.status_code == 200
+        return [port["locode"] for port in response.json()]
+
+    def test_exact_locode_and_name_rank_first(self):
+        """Test that exact LOCODE and exact name hits come first, in any case."""
+        assert self._search(q="egaly")[0] == "EGALY"
+        assert self._search(q="HAMBURG") == ["DEHAM"]
+
+    def test_alias_matches(self):
+        """Test that exact and partial alias hits find their port."""
+        assert self._search(q="dumyat") == ["EGDAM"]
+        assert self._search(q="maasvlak") == ["NLRTM"]
+
+    def test_tiers_order_name_over_alias_over_country(self):
+        """Test partial name > alias > country code > country name ordering."""
+        # "sokhna" is in Ain Sokhna's name and, for the same port, an exact alias
+        assert self._search(q="sokhna") == ["EGSOK"]
+        # Country code hits every Egyptian port, in file order
+        assert self._search(q="eg") == ["EGALY", "EGDAM", "EGPSD", "EGSOK"]
+        # "tanger" is a partial name hit for Tanger-Med only
+        assert self._search(q="tanger") == ["MATNG"]
+
+    def test_partial_matches_never_span_two_entries(self):
+        """Test that a substring across two adjacent names matches nothing."""
+        # "damietta" is followed by "port said" in the file
+        assert self._search(q="damiettaport") == []
+
+    def test_limit_and_no_match(self):
+        """Test that limit caps results and unmatched queries return an empty list."""
+        assert len(self._search(q="a", limit=3)) == 3
+        assert self._search(q="zzzz") == []
+
+    def test_normalized_queries_share_a_cached_result(self):
+        """Test that queries differing only in case/whitespace hit the same cache entry."""
+        from backend.app.routes.ports import _search_ports_cached
+
+        _search_ports_cached.cache_clear()
+        first = self._search(q="Genova")
+        second = self._search(q=" genova ")
+        assert first == second == ["ITGOA"]
+        info = _search_ports_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+
+class TestPortScoring:
+    """Test score_ports tiers on a small hand-built index."""
+
+    PORTS = [
+        {
+            "name": "Alpha",
+            "locode": "XXALP",
+            "country": "XX",
+            "countryName": "Xland",
+            "aliases": ["Betaville", "Beta"],
+        },
+        {"name": "Beta", "locode": "XXBET", "country": "XX", "countryName": "Xland"},
+        {"name": "Gamma", "locode": "YYGAM", "country": "YY", "countryName": "Betania"},
+    ]
+
+    def _scores(self, query):
+        from backend.app.routes.ports import _index_ports, score_ports
+
+        scores = score_ports(_index_ports(self.PORTS), query)
+        return {self.PORTS[i]["locode"]: score for i, score in scores.items()}
+
+    def test_first_matching_alias_decides_alias_score(self):
+        """Test that a partial hit on an earlier alias wins over a later exact alias."""
+        assert self._scores("beta") == {"XXALP": 600, "XXBET": 900, "YYGAM": 300}
+
+    def test_country_tiers(self):
+        """Test country code, exact country name and partial country name tiers."""
+        assert self._scores("xx") == {"XXALP": 500, "XXBET": 500}
+        assert self._scores("xland") == {"XXALP": 400, "XXBET": 400}
+        assert self._scores("land") == {"XXALP": 300, "XXBET": 300}
+
+    def test_country_names_are_scanned_once_per_country(self):
+        """Test that shared country names are indexed once and still reach every port."""
+        from backend.app.routes.ports import _index_ports
+
+        index = _index_ports(self.PORTS)
+        assert index.country_names.text.split("\0") == ["xland", "betania"]
+        assert index.country_name_ports == [(0, 1), (2,)]
+
+    def test_missing_optional_fields(self):
+        """Test that ports without aliases still score on their other fields."""
+        assert self._scores("xxbet") == {"XXBET": 1000}
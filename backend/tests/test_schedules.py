@@ -0,0 +1,89 @@
+"""Tests for the schedules list route and its input handling."""
+
+from unittest.mock import Mock, patch
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.providers.searoutes import SearoutesAPIError, SearoutesRateLimitError
+from backend.app.routes import schedules
+
+client = TestClient(app)
+
+
+class TestScheduleInputValidation:
+    """Test validation and normalization of list query parameters."""
+
+    def test_invalid_dates_are_rejected(self):
+        """Test that malformed and impossible dates both get a 400."""
+        for value in ("garbage", "2025-02-30", "2025-08-20T25:00:00"):
+            response = client.get("/api/schedules", params={"from": value})
+            assert response.status_code == 400, value
+            assert "'from'" in response.json()["detail"]
+
+    def test_valid_dates_are_accepted(self):
+        """Test that date-only and Z-suffixed timestamps pass validation."""
+        for value in (
+            "2025-08-20",
+            "2025-08-20T10:00:00Z",
+            "2025-08-20T10:00:00+02:00",
+        ):
+            assert client.get("/api/schedules", params={"to": value}).status_code == 200
+
+
+class TestScheduleListSerialization:
+    """Test the list envelope encoding."""
+
+    def test_streamed_and_buffered_envelopes_match(self):
+        """Test that the streamed response encodes byte-for-byte like the buffered one."""
+        params = {"pageSize": 20}
+        buffered = client.get("/api/schedules", params=params)
+        with patch("backend.app.routes.schedules.STREAM_THRESHOLD", 0), patch(
+            "backend.app.routes.schedules.STREAM_BATCH_ITEMS", 3
+        ):
+            streamed = client.get("/api/schedules", params=params)
+
+        assert buffered.headers["content-type"] == streamed.headers["content-type"]
+        assert buffered.content == streamed.content
+        body = buffered.json()
+        assert set(body) == {"items", "total", "page", "pageSize"}
+        assert len(body["items"]) == 20
+
+
+class TestCo2Details:
+    """Test the CO2 details proxy."""
+
+    def _get(self, make_request):
+        provider = Mock(spec=["list", "_make_request"])
+        provider._make_request = make_request
+        with patch.object(schedules, "provider", provider):
+            return client.get("/api/schedules/abc123/co2")
+
+    def test_upstream_json_is_relayed_verbatim(self):
+        """Test that the Searoutes body is passed through byte-for-byte."""
+        body = b'{"co2e":{"total":1234.5},"hash":"abc123"}'
+        make_request = Mock(return_value=Mock(content=body))
+
+        response = self._get(make_request)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == body
+        make_request.assert_called_once_with("/co2/v2/execution/abc123")
+
+    def test_upstream_errors_keep_their_status(self):
+        """Test that Searoutes 404/4xx/5xx and rate limits map to matching statuses."""
+        cases = [
+            (SearoutesAPIError(404, "missing"), 404),
+            (SearoutesAPIError(400, "bad hash"), 400),
+            (SearoutesAPIError(503, "down"), 503),
+            (SearoutesRateLimitError(), 429),
+            (RuntimeError("boom"), 500),
+        ]
+        for error, status in cases:
+            assert self._get(Mock(side_effect=error)).status_code == status, error
+
+    def test_unsupported_provider_is_501(self):
+        """Test that providers without a Searoutes client report 501."""
+        with patch.object(schedules, "provider", Mock(spec=["list"])):
+            assert client.get("/api/schedules/abc123/co2").status_code == 501
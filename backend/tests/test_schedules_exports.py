@@ -0,0 +1,198 @@
+"""Tests for the schedule export helpers."""
+
+import csv
+import gc
+import inspect
+import io
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+
+from backend.app.main import app
+from backend.app.models.schedule import Schedule
+from backend.app.providers.base import ScheduleProvider
+from backend.app.providers.searoutes import SearoutesAPIError, SearoutesRateLimitError
+from backend.app.routes import schedules
+from backend.app.routes.schedules import (
+    EXPORT_COLUMNS,
+    XLSX_COLUMN_WIDTHS,
+    export_row,
+    export_schedules_csv,
+    export_schedules_xlsx,
+    iter_schedules_csv,
+)
+
+
+def _schedule(i: int) -> Schedule:
+    return Schedule(
+        id=str(i),
+        origin="Alexandria, EG",
+        destination="Somewhere Far, XX",
+        etd="2025-08-20T10:00:00Z",
+        eta="2025-08-25T10:00:00Z",
+        vessel=f"Vessel {i}",
+        voyage=f"V{i}",
+        routingType="Direct",
+        transitDays=5,
+        carrier="MSC",
+    )
+
+
+class TestCsvExport:
+    """Test the streamed CSV export."""
+
+    def test_rows_are_streamed_in_batches(self):
+        """Test that the CSV arrives in batch-sized chunks that join into one file."""
+        with patch("backend.app.routes.schedules.CSV_BATCH_ROWS", 2):
+            chunks = list(iter_schedules_csv([_schedule(i) for i in range(5)]))
+
+        # Header on its own, then batches of 2, 2 and 1 rows
+        assert len(chunks) == 4
+        assert chunks[0].count("\n") == 1
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        assert rows[0][:2] == ["originLocode", "destinationLocode"]
+        assert [row[4] for row in rows[1:]] == [f"Vessel {i}" for i in range(5)]
+        assert rows[1][:2] == ["EGALY", "SOMEW"]
+        assert rows[1][9] == ""
+
+    def test_rows_are_pulled_one_batch_at_a_time(self):
+        """Test that the header precedes any read and the source is read batch by batch."""
+        pulled = []
+
+        def source():
+            for i in range(5):
+                pulled.append(i)
+                yield _schedule(i)
+
+        with patch("backend.app.routes.schedules.CSV_BATCH_ROWS", 2):
+            chunks = iter_schedules_csv(source())
+            assert next(chunks).startswith("originLocode,")
+            assert pulled == []
+            next(chunks)
+            assert pulled == [0, 1]
+            assert len(list(chunks)) == 2
+        assert pulled == [0, 1, 2, 3, 4]
+
+    def test_output_matches_csv_writer(self):
+        """Test that plain and quoting-needed batches both come out as csv.writer writes them."""
+        items = [_schedule(i) for i in range(4)]
+        items[2].vessel = 'Vessel "Two", Jr'
+        items[3].voyage = "V3\nB"
+
+        for batch in (items[:2], items):
+            expected = io.StringIO()
+            writer = csv.writer(expected)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(map(export_row, batch))
+            assert "".join(iter_schedules_csv(batch)) == expected.getvalue()
+
+    def test_unset_fields_match_csv_writer(self):
+        """Test that None fields come out empty, as csv.writer writes them."""
+        items = [_schedule(i) for i in range(3)]
+        items[1].vessel = None
+
+        expected = io.StringIO()
+        writer = csv.writer(expected)
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(map(export_row, items))
+        output = "".join(iter_schedules_csv(items))
+        assert output == expected.getvalue()
+        assert "None" not in output
+
+    def test_empty_export_has_header_only(self):
+        """Test that an export with no schedules is just the header row."""
+        chunks = list(iter_schedules_csv([]))
+        assert "".join(chunks).splitlines() == [
+            "originLocode,destinationLocode,etd,eta,vessel,voyage,carrier,routingType,"
+            "transitDays,service"
+        ]
+
+
+class TestXlsxExport:
+    """Test the Excel export endpoint."""
+
+    def test_workbook_has_header_and_one_row_per_schedule(self):
+        """Test that the write-only workbook round-trips through openpyxl."""
+        items = [_schedule(i) for i in range(3)]
+        provider = type(
+            "Provider",
+            (ScheduleProvider,),
+            {"list": lambda self, flt, page: (items, page)},
+        )()
+        with patch.object(schedules, "provider", provider):
+            response = TestClient(app).get("/api/schedules.xlsx")
+
+        assert response.status_code == 200
+        ws = load_workbook(io.BytesIO(response.content))["Schedules"]
+        rows = list(ws.iter_rows(values_only=True))
+        assert rows[0][:3] == ("originLocode", "destinationLocode", "etd")
+        assert [row[4] for row in rows[1:]] == ["Vessel 0", "Vessel 1", "Vessel 2"]
+        assert rows[1][8] == 5
+
+    def test_every_column_has_a_fixed_width(self):
+        """Test that the xlsx width table covers every export column."""
+        assert len(XLSX_COLUMN_WIDTHS) == len(EXPORT_COLUMNS)
+        assert all(
+            width >= len(name)
+            for name, width in zip(EXPORT_COLUMNS, XLSX_COLUMN_WIDTHS)
+        )
+
+
+class TestExportHandlers:
+    """Test how the export handlers are scheduled."""
+
+    def test_provider_errors_are_reported_before_the_export_starts(self):
+        """Test that a failing provider gives both exports an error status, not a 200."""
+        cases = [
+            (SearoutesAPIError(503, "down"), 502),
+            (SearoutesAPIError(400, "bad port"), 400),
+            (SearoutesRateLimitError(), 429),
+        ]
+        for error, status in cases:
+
+            def fail(self, flt, page, error=error):
+                raise error
+
+            provider = type("Provider", (ScheduleProvider,), {"list": fail})()
+            with patch.object(schedules, "provider", provider):
+                client = TestClient(app)
+                for path in ("/api/schedules.csv", "/api/schedules.xlsx"):
+                    response = client.get(path)
+                    assert response.status_code == status, (path, error)
+                    assert response.json()["detail"]["code"] == error.code
+
+    @pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+    def test_failed_xlsx_export_leaves_no_workbook_behind(self):
+        """Test that a provider failure is raised before any write-only sheet is started.
+
+        An abandoned sheet's row writer fails when it is garbage collected.
+        """
+
+        def fail(self, flt, page):
+            raise SearoutesAPIError(503, "down")
+
+        provider = type("Provider", (ScheduleProvider,), {"list": fail})()
+        with patch.object(schedules, "provider", provider):
+            assert TestClient(app).get("/api/schedules.xlsx").status_code == 502
+        gc.collect()
+
+    def test_exports_are_sync_handlers(self):
+        """Test that exports stay plain functions, which FastAPI runs in its threadpool.
+
+        An async def handler would format the whole export on the event loop.
+        """
+        assert not inspect.iscoroutinefunction(export_schedules_csv)
+        assert not inspect.iscoroutinefunction(export_schedules_xlsx)
+
+    def test_openpyxl_is_not_imported_at_startup(self):
+        """Test that importing the app leaves openpyxl to the first xlsx export."""
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        repo_root = os.path.dirname(os.path.dirname(tests_dir))
+        code = "import sys, backend.app.main; sys.exit('openpyxl' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo_root)
+        assert result.returncode == 0
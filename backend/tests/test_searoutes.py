@@ -2,19 +2,20 @@
 
 from unittest.mock import Mock
 
+import orjson
 import pytest
 
-from backend.app.providers.searoutes import SearoutesProvider
+from backend.app.providers.searoutes import SearoutesAPIError, SearoutesError, SearoutesProvider
 
 
 class TestSearoutesSmartRanking:
     """Test smart ranking for ports and carriers per Task 19 spec."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setup_class(cls):
+        """Set up one provider for the class; ranking reads no provider state."""
         # Mock client to avoid actual API calls
-        mock_client = Mock()
-        self.provider = SearoutesProvider(client=mock_client)
+        cls.provider = SearoutesProvider(client=Mock())
 
     def test_rank_ports_exact_locode_wins_for_locode_query(self):
         """Test that exact LOCODE match wins for LOCODE queries."""
@@ -29,6 +30,18 @@ class TestSearoutesSmartRanking:
         assert result["locode"] == "EGALY"
         assert result["name"] == "Alexandria"
 
+    def test_rank_ports_exact_locode_hits_keep_size_tiebreaker(self):
+        """Test that several exact LOCODE hits are still ordered by size."""
+        ports = [
+            {"name": "Alexandria Old", "locode": "EGALY", "country": "EG", "size": 100},
+            {"name": "Port Said", "locode": "EGPSD", "country": "EG", "size": 900},
+            {"name": "Alexandria", "locode": "EG ALY", "country": "EG", "size": 300},
+        ]
+
+        result = self.provider._rank_ports(ports, "EGALY", is_locode_query=True)
+
+        assert result["name"] == "Alexandria"
+
     def test_rank_ports_exact_name_wins_for_name_query(self):
         """Test that exact name match wins for name queries."""
         ports = [
@@ -55,6 +68,23 @@ class TestSearoutesSmartRanking:
         assert result["locode"] == "EGALY"
         assert result["size"] == 200
 
+    def test_rank_ports_tiebreakers_only_apply_within_a_score(self):
+        """Test that score beats size, size beats name, whatever the input order."""
+        from itertools import permutations
+
+        ports = [
+            {"name": "Alexandria", "locode": "EGALY", "size": 10},  # exact name
+            {"name": "Alexandria West", "locode": "EGAWX", "size": 500},  # startswith
+            {"name": "Alexandria East", "locode": "EGAEX", "size": 500},
+            {"name": "New Alexandria", "locode": "EGNAX", "size": 900},  # contains
+        ]
+
+        for order in permutations(ports):
+            assert self.provider._rank_ports(list(order), "Alexandria", False) is ports[0]
+            assert self.provider._rank_ports(list(order), "Alexandria E", False) is ports[2]
+            without_exact = [p for p in order if p is not ports[0]]
+            assert self.provider._rank_ports(without_exact, "Alexandria", False) is ports[2]
+
     def test_rank_ports_startswith_beats_contains(self):
         """Test that startswith beats contains in ranking."""
         ports = [
@@ -98,6 +128,27 @@ class TestSearoutesSmartRanking:
         assert result["name"] == "Alexandría"
         assert result["locode"] == "EGALY"
 
+    def test_ascii_norm_folding(self):
+        """Test that names fold to one form: marks stripped, compatibility forms, casefold."""
+        from backend.app.providers.searoutes import _ascii_norm
+
+        assert _ascii_norm("Alexandría") == "alexandria"
+        assert _ascii_norm("  Port   Saïd ") == "port said"
+        assert _ascii_norm("Straße") == _ascii_norm("STRASSE") == "strasse"
+        assert _ascii_norm("ＡＢＣ") == "abc"  # fullwidth letters
+        assert _ascii_norm("Le Havre\u00a0Port") == "le havre port"
+        assert _ascii_norm("") == ""
+
+    def test_ascii_norm_skips_unicode_normalization_for_ascii(self):
+        """Test that pure-ASCII names never go through unicodedata.normalize."""
+        from unittest.mock import patch
+
+        from backend.app.providers.searoutes import _ascii_norm
+
+        with patch("backend.app.providers.searoutes.unicodedata.normalize") as normalize:
+            assert _ascii_norm("Quick  Check Harbour") == "quick check harbour"
+        normalize.assert_not_called()
+
     def test_rank_carriers_exact_scac_wins_for_scac_query(self):
         """Test that exact SCAC match wins for SCAC queries."""
         carriers = [
@@ -111,6 +162,24 @@ class TestSearoutesSmartRanking:
         assert result["scac"] == "MAEU"
         assert result["name"] == "Maersk Line"
 
+    def test_rank_carriers_exact_scac_hits_skip_name_scoring(self):
+        """Test that a lone exact SCAC hit returns unscored and several tie-break by name."""
+        from unittest.mock import patch
+
+        carriers = [
+            {"name": "Zeta Lines", "scac": "ZZZZ", "id": "1"},
+            {"name": "Maersk", "scac": "MAEU", "id": "2"},
+            {"name": "Maersk Line", "scac": "MA-EU", "id": "3"},
+        ]
+
+        with patch("backend.app.providers.searoutes._name_match") as name_match:
+            result = self.provider._rank_carriers(carriers, "ZZZZ", is_scac_query=True)
+        assert result["id"] == "1"
+        name_match.assert_not_called()
+
+        result = self.provider._rank_carriers(carriers[::-1], "MAEU", is_scac_query=True)
+        assert result["id"] == "2"
+
     def test_rank_carriers_exact_name_wins_for_name_query(self):
         """Test that exact name match wins for name queries."""
         carriers = [
@@ -202,6 +271,17 @@ class TestSearoutesSmartRanking:
         assert _carrier_scac(carrier_alternative) == "CMDU"
         assert _carrier_id(carrier_alternative) == "2"
 
+    def test_field_extraction_precedence(self):
+        """Test alias order, empty-value skipping, nested fallback and str coercion."""
+        from backend.app.providers.searoutes import _carrier_id, _port_locode, _port_name
+
+        assert _port_name({"displayName": "Shown", "name": "Raw"}) == "Shown"
+        assert _port_name({"displayName": "", "name": None, "portName": "Third"}) == "Third"
+        assert _port_name({"name": "Top", "attributes": {"name": "Nested"}}) == "Top"
+        assert _port_locode({"attributes": {"locode": "EGALY"}}) == "EGALY"
+        assert _carrier_id({"carrierId": 42}) == "42"
+        assert _port_name({}) == "" and _port_locode({"attributes": None}) == ""
+
     def test_rank_ports_locode_query_with_spaces_and_dashes(self):
         """Test that LOCODE queries handle spaces and dashes correctly."""
         ports = [
@@ -220,6 +300,33 @@ class TestSearoutesSmartRanking:
         assert self.provider._rank_ports([], "test", False) == {}
         assert self.provider._rank_carriers([], "test", False) == {}
 
+    def test_rank_single_candidate_is_returned_unscored(self):
+        """Test that a one-element list is returned as is, even when it does not match."""
+        from unittest.mock import patch
+
+        port = {"name": "Port Said", "locode": "EGPSD", "size": 100}
+        carrier = {"name": "Maersk", "scac": "MAEU", "id": "1"}
+
+        with patch("backend.app.providers.searoutes._name_match") as name_match:
+            assert self.provider._rank_ports([port], "Alexandria", False) is port
+            assert self.provider._rank_ports([port], "EGALY", True) is port
+            assert self.provider._rank_carriers([carrier], "CMA CGM", False) is carrier
+        name_match.assert_not_called()
+
+    def test_rank_full_ties_return_first_candidate(self):
+        """Test that candidates with identical rank keys resolve to the first one."""
+        ports = [
+            {"name": "Alexandria", "locode": "EGALY", "size": 100, "id": 1},
+            {"name": "Alexandria", "locode": "EGALY", "size": 100, "id": 2},
+        ]
+        carriers = [
+            {"name": "Maersk", "scac": "MAEU", "id": 1},
+            {"name": "Maersk", "scac": "MAEU", "id": 2},
+        ]
+
+        assert self.provider._rank_ports(ports, "Alexandria", False)["id"] == 1
+        assert self.provider._rank_carriers(carriers, "MAEU", True)["id"] == 1
+
     def test_locode_pattern_matching(self):
         """Test that LOCODE pattern recognition works correctly."""
         # Should recognize valid LOCODEs (2 letters + 3 alphanumeric)
@@ -243,6 +350,25 @@ class TestSearoutesSmartRanking:
         result2 = self.provider._rank_carriers(carriers2, "XX", is_scac_query=True)
         assert result2["scac"] == "XX"
 
+    def test_pattern_helpers_match_the_spec_regexes(self):
+        """Test that the str-method LOCODE/SCAC checks agree with the documented patterns."""
+        import re
+
+        from backend.app.providers.searoutes import _alnum_upper, _is_locode, _is_scac
+
+        locode_re = re.compile(r"[A-Z]{2}[A-Z0-9]{3}")
+        scac_re = re.compile(r"[A-Z0-9]{2,4}")
+        samples = ["EGPSD", "US123", "12ABC", "egpsd", "EGPS", "EGPSDX", "MAEU", "XX", "X", "É1AB"]
+        samples += ["A1", "1234", "AB-C", "EG PSD", ""]
+        for q in samples:
+            assert _is_locode(q) == bool(locode_re.fullmatch(q)), q
+            assert _is_scac(q) == bool(scac_re.fullmatch(q)), q
+
+        assert _alnum_upper(" eg-psd ") == "EGPSD"
+        assert _alnum_upper("Alexandría 2") == "ALEXANDRA2"
+        # Canonical codes are interned: equal codes from different inputs share one object
+        assert _alnum_upper("eg psd") is _alnum_upper("EG-PSD")
+
     def test_port_noise_stripping_improves_startswith_matching(self):
         """Test that port name noise stripping improves startswith matching."""
         ports = [
@@ -262,6 +388,57 @@ class TestSearoutesSmartRanking:
         assert result["name"] == "Port of Alexandria"
         assert result["locode"] == "EGALY"
 
+    def test_rank_ports_full_tier_order_in_both_modes(self):
+        """Test the whole tier ladder, with the LOCODE tier first or last by query type."""
+        ports = [
+            {"name": "Nothing", "locode": "XXEEE"},  # no match
+            {"name": "Zzz", "locode": "ALEX"},  # exact LOCODE
+            {"name": "New Alex", "locode": "XXCCC"},  # contains
+            {"name": "Alexandria", "locode": "XXBBB"},  # startswith
+            {"name": "Alex", "locode": "XXAAA"},  # exact name
+        ]
+
+        def order(is_locode_query):
+            left, picked = list(ports), []
+            while left:
+                best = self.provider._rank_ports(left, "Alex", is_locode_query)
+                picked.append(best["locode"])
+                left.remove(best)
+            return picked
+
+        assert order(False) == ["XXAAA", "XXBBB", "XXCCC", "ALEX", "XXEEE"]
+        assert order(True) == ["ALEX", "XXAAA", "XXBBB", "XXCCC", "XXEEE"]
+
+    def test_reranking_reuses_normalized_names(self):
+        """Test that a repeat ranking re-folds and re-matches no candidate name."""
+        from backend.app.providers.searoutes import _ascii_norm, _name_match
+
+        ports = [
+            {"name": "Port of Alexandria", "locode": "EGALY", "size": 50},
+            {"name": "New Alexandria", "locode": "USNAL", "size": 100},
+        ]
+        self.provider._rank_ports(ports, "Alexandria", is_locode_query=False)
+
+        norm_misses = _ascii_norm.cache_info().misses
+        match_misses = _name_match.cache_info().misses
+        result = self.provider._rank_ports(ports, "Alexandria", is_locode_query=False)
+
+        assert result["locode"] == "EGALY"
+        assert _ascii_norm.cache_info().misses == norm_misses
+        assert _name_match.cache_info().misses == match_misses
+        # Memoized on the side; the caller's dicts are left untouched
+        assert all(set(p) == {"name", "locode", "size"} for p in ports)
+
+    def test_name_match_tiers(self):
+        """Test the shared name tiers: exact > startswith > contains (substring or tokens)."""
+        from backend.app.providers.searoutes import _name_match
+
+        assert _name_match("port said", "port said") == 3
+        assert _name_match("port of alexandria", "alex", strip_noise=True) == 2
+        assert _name_match("port of alexandria", "alex") == 1
+        assert _name_match("hapag lloyd", "lloyd hap") == 1
+        assert _name_match("hapag lloyd", "msc") == 0
+
 
 class TestSearoutesErrorMapping:
     """Test error code mapping functionality for Task 21."""
@@ -302,7 +479,7 @@ class TestSearoutesErrorMapping:
         mock_response = Mock()
         mock_response.status_code = 400
         mock_response.reason_phrase = "Bad Request"
-        mock_response.json.return_value = {"code": "3110", "message": "Invalid LOCODE provided"}
+        mock_response.content = orjson.dumps({"code": "3110", "message": "Invalid LOCODE provided"})
 
         result = self.provider._extract_error_message(mock_response)
         assert result == "Unknown origin/destination port"
@@ -312,11 +489,57 @@ class TestSearoutesErrorMapping:
         mock_response = Mock()
         mock_response.status_code = 400
         mock_response.reason_phrase = "Bad Request"
-        mock_response.json.return_value = {"code": "9999", "message": "Some other error"}
+        mock_response.content = orjson.dumps({"code": "9999", "message": "Some other error"})
 
         result = self.provider._extract_error_message(mock_response)
         assert result == "Some other error"
 
+    def test_error_to_dict_defaults_code_and_omits_missing_request_id(self):
+        """Test the API error payload for errors with and without code/request id."""
+        assert SearoutesError("boom").to_dict() == {"code": "SEAROUTES_ERROR", "message": "boom"}
+        assert SearoutesAPIError(502, "Bad gateway", "req-9").to_dict() == {
+            "code": "HTTP_502",
+            "message": "Bad gateway",
+            "request_id": "req-9",
+        }
+
+    def test_error_response_body_is_decoded_once(self):
+        """Test that request id and message come from a single decode of the error body."""
+        from unittest.mock import patch
+
+        bad_request = Mock(status_code=400, headers={}, reason_phrase="Bad Request")
+        bad_request.content = orjson.dumps({"requestId": "req-1", "message": "Bad origin"})
+        self.provider.client.get = Mock(return_value=bad_request)
+
+        with patch("backend.app.providers.searoutes.orjson.loads", wraps=orjson.loads) as loads:
+            with pytest.raises(SearoutesAPIError) as exc:
+                self.provider._make_request("/x")
+
+        assert loads.call_count == 1
+        assert exc.value.request_id == "req-1"
+        assert "Bad origin" in str(exc.value)
+
+    def test_rate_limit_body_is_only_decoded_without_request_id_header(self):
+        """Test that a final 429 reads the request id header before parsing the body."""
+        from unittest.mock import patch
+
+        from backend.app.providers.searoutes import SearoutesRateLimitError
+
+        throttled = Mock(status_code=429, headers={"x-request-id": "hdr-1"})
+        throttled.content = orjson.dumps({"requestId": "body-1"})
+        self.provider.client.get = Mock(return_value=throttled)
+
+        with patch("backend.app.providers.searoutes.orjson.loads", wraps=orjson.loads) as loads:
+            with pytest.raises(SearoutesRateLimitError) as exc:
+                self.provider._make_request("/x", max_retries=0)
+        assert loads.call_count == 0
+        assert exc.value.request_id == "hdr-1"
+
+        throttled.headers = {}
+        with pytest.raises(SearoutesRateLimitError) as exc:
+            self.provider._make_request("/x", max_retries=0)
+        assert exc.value.request_id == "body-1"
+
 
 class TestSearoutesCaching:
     """Test caching functionality for Task 21."""
@@ -331,11 +554,11 @@ class TestSearoutesCaching:
         import time
 
         # Mock the _make_request to return a port result
-        def mock_make_request(endpoint, params):
+        def mock_make_request(endpoint, params, **kwargs):
             mock_response = Mock()
-            mock_response.json.return_value = [
-                {"name": "Test Port", "locode": "TSTPT", "country": "TS"}
-            ]
+            mock_response.content = orjson.dumps(
+                [{"name": "Test Port", "locode": "TSTPT", "country": "TS"}]
+            )
             return mock_response
 
         self.provider._make_request = Mock(side_effect=mock_make_request)
@@ -358,11 +581,11 @@ class TestSearoutesCaching:
         import time
 
         # Mock the _make_request to return a carrier result
-        def mock_make_request(endpoint, params):
+        def mock_make_request(endpoint, params, **kwargs):
             mock_response = Mock()
-            mock_response.json.return_value = [
-                {"name": "Test Carrier", "scac": "TSTC", "id": "123"}
-            ]
+            mock_response.content = orjson.dumps(
+                [{"name": "Test Carrier", "scac": "TSTC", "id": "123"}]
+            )
             return mock_response
 
         self.provider._make_request = Mock(side_effect=mock_make_request)
@@ -376,9 +599,607 @@ class TestSearoutesCaching:
         cached_result, cached_time = self.provider._carrier_cache[cache_key]
 
         assert cached_result["name"] == "Test Carrier"
-        assert abs(time.time() - cached_time) < 2  # Should be within 2 seconds of now
+        assert abs(time.monotonic() - cached_time) < 2  # Should be within 2 seconds of now
 
         # Second call should hit cache
         result2 = self.provider.resolve_carrier("TSTC")
         assert result2["name"] == "Test Carrier"
         assert self.provider._make_request.call_count == 1  # No additional API call
+
+    def test_lookup_cache_evicts_least_recently_used(self):
+        """Test that the lookup caches stay bounded and evict the coldest entry."""
+        from unittest.mock import patch
+
+        cache = self.provider._port_cache
+        with patch("backend.app.providers.searoutes.LOOKUP_CACHE_MAX_ENTRIES", 2):
+            self.provider._cache_put(cache, "a", {"locode": "A"}, 0.0)
+            self.provider._cache_put(cache, "b", {"locode": "B"}, 0.0)
+            assert self.provider._cache_get(cache, "a", 1.0) == {"locode": "A"}
+            self.provider._cache_put(cache, "c", {"locode": "C"}, 0.0)
+
+        assert list(cache) == ["a", "c"]
+
+    def test_resolve_hit_refreshes_recency(self):
+        """Test that serving a lookup from cache makes it the most recently used entry."""
+        self.provider._lookup_carrier = Mock(side_effect=lambda q: {"scac": q.upper()})
+
+        self.provider.resolve_carrier("msc")
+        self.provider.resolve_carrier("maeu")
+        self.provider.resolve_carrier("msc")
+
+        assert list(self.provider._carrier_cache) == ["maeu", "msc"]
+        assert self.provider._lookup_carrier.call_count == 2
+
+    def test_concurrent_identical_lookups_share_one_request(self):
+        """Test that simultaneous misses for the same carrier issue a single request."""
+        import threading
+        import time
+
+        def slow_make_request(endpoint, params, **kwargs):
+            time.sleep(0.2)
+            mock_response = Mock()
+            mock_response.content = orjson.dumps([{"name": "Maersk", "scac": "MAEU"}])
+            return mock_response
+
+        self.provider._make_request = Mock(side_effect=slow_make_request)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.provider.resolve_carrier("MAEU")))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert self.provider._make_request.call_count == 1
+        assert [r["scac"] for r in results] == ["MAEU"] * 3
+        assert self.provider._inflight == {}
+
+    def test_failed_lookup_is_not_cached(self):
+        """Test that a lookup error propagates and leaves nothing cached or in flight."""
+        self.provider._make_request = Mock(side_effect=SearoutesError("boom"))
+
+        with pytest.raises(SearoutesError):
+            self.provider.resolve_port("Alexandria")
+
+        assert len(self.provider._port_cache) == 0
+        assert self.provider._inflight == {}
+
+    def test_locode_port_lookups_outlive_name_lookups(self):
+        """Test that LOCODE port entries use the day-long TTL and names the hourly one."""
+        import time
+
+        two_hours_ago = time.monotonic() - 7200
+        self.provider._cache_put(
+            self.provider._port_cache, "egaly", {"locode": "EGALY"}, two_hours_ago
+        )
+        self.provider._cache_put(
+            self.provider._port_cache, "alexandria", {"locode": "EGALY"}, two_hours_ago
+        )
+        # A client error, so the expired entry is not served as a stale fallback
+        self.provider._make_request = Mock(side_effect=SearoutesAPIError(400, "rejected"))
+
+        assert self.provider.resolve_port("EGALY") == {"locode": "EGALY"}
+        with pytest.raises(SearoutesError):
+            self.provider.resolve_port("Alexandria")
+
+    def test_cached_lookups_are_read_only(self):
+        """Test that the lookup result shared through the cache cannot be mutated."""
+        response = Mock(content=orjson.dumps([{"name": "Maersk", "scac": "MAEU"}]))
+        self.provider._make_request = Mock(return_value=response)
+
+        first = self.provider.resolve_carrier("MAEU")
+        with pytest.raises(TypeError):
+            first["scac"] = "XXXX"
+        assert self.provider.resolve_carrier("MAEU")["scac"] == "MAEU"
+        assert self.provider._make_request.call_count == 1
+
+    def test_five_letter_port_names_use_the_hourly_ttl(self):
+        """Test that a LOCODE-shaped name resolved by name does not get the day-long TTL."""
+        import time
+
+        two_hours_ago = time.monotonic() - 7200
+        self.provider._cache_put(
+            self.provider._port_cache, "genoa", {"name": "Genova", "locode": "ITGOA"}, two_hours_ago
+        )
+        self.provider._make_request = Mock(side_effect=SearoutesAPIError(400, "rejected"))
+
+        assert not self.provider._lookup_is_cached("port", self.provider._port_cache, "Genoa")
+        with pytest.raises(SearoutesError):
+            self.provider.resolve_port("Genoa")
+
+    def test_expired_lookup_is_served_while_searoutes_is_down(self):
+        """Test that an expired entry stands in for a lookup that fails upstream."""
+        from backend.app.providers.searoutes import SearoutesRateLimitError
+
+        import time
+
+        two_hours_ago = time.monotonic() - 7200
+        self.provider._cache_put(
+            self.provider._carrier_cache, "msc", {"scac": "MSCU"}, two_hours_ago
+        )
+        self.provider._make_request = Mock(side_effect=SearoutesRateLimitError())
+
+        assert self.provider.resolve_carrier("MSC") == {"scac": "MSCU"}
+        assert self.provider.resolve_carrier("MSC") == {"scac": "MSCU"}
+        # Still expired, so every call revalidates against Searoutes first
+        assert self.provider._make_request.call_count == 2
+        assert self.provider._inflight == {}
+
+    def test_lookups_use_the_shorter_retry_budget(self):
+        """Test that port/carrier lookups ask _make_request for fewer retries."""
+        from backend.app.providers.searoutes import LOOKUP_MAX_RETRIES
+
+        response = Mock(content=orjson.dumps([{"name": "Maersk", "scac": "MAEU"}]))
+        self.provider._make_request = Mock(return_value=response)
+
+        self.provider.resolve_carrier("MAEU")
+
+        assert self.provider._make_request.call_args.kwargs["max_retries"] == LOOKUP_MAX_RETRIES
+
+    def test_lookup_cache_drops_expired_entries(self):
+        """Test that entries older than the TTL are treated as misses and removed."""
+        cache = self.provider._carrier_cache
+        self.provider._cache_put(cache, "msc", {"scac": "MSCU"}, 0.0)
+
+        assert self.provider._cache_get(cache, "msc", 3600.0) is None
+        assert "msc" not in cache
+
+
+class TestSearoutesListLookups:
+    """Test how list() combines the port and carrier lookups."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        mock_client = Mock()
+        self.provider = SearoutesProvider(client=mock_client)
+        self.provider.resolve_port = Mock(
+            side_effect=lambda q: {"name": q.title(), "locode": q.upper(), "country": q[:2].upper()}
+        )
+        self.provider.resolve_carrier = Mock(return_value={"scac": "MAEU"})
+
+        mock_response = Mock()
+        mock_response.content = b"[]"
+        self.provider._make_request = Mock(return_value=mock_response)
+
+    def test_resolved_lookups_feed_itinerary_params(self):
+        """Test that resolved ports and carrier are passed to the itinerary call."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        flt = ScheduleFilter(origin="egaly", destination="nlrtm", carrier="maersk")
+        self.provider.list(flt, Page())
+
+        endpoint = self.provider._make_request.call_args.args[0]
+        params = self.provider._make_request.call_args.kwargs["params"]
+        assert endpoint == "/itinerary/v2/execution"
+        assert params["fromLocode"] == "EGALY"
+        assert params["toLocode"] == "NLRTM"
+        assert params["carrierScac"] == "MAEU"
+
+    def test_lookups_run_concurrently(self):
+        """Test that port and carrier lookups overlap instead of running back to back."""
+        import threading
+
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        # Each lookup waits until all three are in flight; sequential calls would time out
+        barrier = threading.Barrier(3, timeout=2)
+
+        def port(q):
+            barrier.wait()
+            return {"name": q, "locode": q.upper(), "country": "XX"}
+
+        def carrier(q):
+            barrier.wait()
+            return {"scac": "MAEU"}
+
+        self.provider.resolve_port = Mock(side_effect=port)
+        self.provider.resolve_carrier = Mock(side_effect=carrier)
+
+        flt = ScheduleFilter(origin="egaly", destination="nlrtm", carrier="maersk")
+        self.provider.list(flt, Page())
+
+        params = self.provider._make_request.call_args.kwargs["params"]
+        assert (params["fromLocode"], params["toLocode"], params["carrierScac"]) == (
+            "EGALY",
+            "NLRTM",
+            "MAEU",
+        )
+
+    def test_cached_lookups_skip_the_thread_pool(self):
+        """Test that only cache misses are handed to the pool, and only if two overlap."""
+        import time
+        from unittest.mock import patch
+
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        from backend.app.providers.searoutes import _RESOLVE_POOL
+
+        provider = SearoutesProvider(client=Mock())
+        provider._make_request = self.provider._make_request
+        now = time.monotonic()
+        for locode in ("EGALY", "NLRTM"):
+            port = {"locode": locode, "name": locode.title(), "country": locode[:2]}
+            provider._cache_put(provider._port_cache, locode.lower(), port, now)
+        provider._lookup_carrier = Mock(return_value={"scac": "MAEU"})
+        provider._lookup_port = Mock(
+            return_value={"locode": "ESVLC", "name": "Valencia", "country": "ES"}
+        )
+
+        with patch.object(_RESOLVE_POOL, "submit", wraps=_RESOLVE_POOL.submit) as submit:
+            flt = ScheduleFilter(origin="EGALY", destination="NLRTM", carrier="maersk")
+            provider.list(flt, Page())
+            assert submit.call_count == 0
+
+            flt = ScheduleFilter(origin="EGALY", destination="valencia", carrier="msc")
+            provider.list(flt, Page())
+            assert submit.call_count == 2
+
+        params = provider._make_request.call_args.kwargs["params"]
+        assert (params["fromLocode"], params["toLocode"], params["carrierScac"]) == (
+            "EGALY",
+            "ESVLC",
+            "MAEU",
+        )
+
+    def test_unknown_port_returns_empty_results(self):
+        """Test that a port lookup miss short-circuits to an empty result."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        self.provider.resolve_port = Mock(side_effect=ValueError("not found"))
+
+        items, _ = self.provider.list(ScheduleFilter(origin="nowhere"), Page())
+
+        assert items == []
+        self.provider._make_request.assert_not_called()
+
+    def test_unknown_carrier_drops_carrier_filter(self):
+        """Test that a carrier lookup miss continues without carrierScac."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        self.provider.resolve_carrier = Mock(side_effect=ValueError("not found"))
+
+        self.provider.list(ScheduleFilter(origin="egaly", carrier="unknown"), Page())
+
+        params = self.provider._make_request.call_args.kwargs["params"]
+        assert "carrierScac" not in params
+
+    def test_lookup_api_errors_propagate_unchanged(self):
+        """Test that a Searoutes error from a lookup reaches the caller as-is."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        error = SearoutesAPIError(502, "Bad gateway")
+        self.provider.resolve_carrier = Mock(side_effect=error)
+
+        with pytest.raises(SearoutesAPIError) as exc:
+            self.provider.list(ScheduleFilter(origin="egaly", carrier="maersk"), Page())
+        assert exc.value is error
+
+    def test_unexpected_errors_are_wrapped_with_cause(self):
+        """Test that non-Searoutes failures become SearoutesError chained to the original."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        self.provider._make_request.return_value.content = b"not json"
+
+        with pytest.raises(SearoutesError) as exc:
+            self.provider.list(ScheduleFilter(origin="egaly"), Page())
+        assert exc.value.__cause__ is not None
+        assert str(exc.value).startswith("Unexpected error:")
+
+    def test_pages_of_one_query_share_an_itinerary_call(self):
+        """Test that paging and re-listing a query reuse the cached itineraries."""
+        from backend.app.providers.base import Page, ScheduleFilter
+
+        itineraries = [
+            {
+                "id": f"it-{i}",
+                "carrier": "MSC",
+                "legs": [{"etd": f"2025-08-2{i}T10:00:00Z", "eta": "2025-09-01T10:00:00Z"}],
+            }
+            for i in range(3)
+        ]
+        self.provider._make_request.return_value.content = orjson.dumps(itineraries)
+        flt = ScheduleFilter(origin="egaly", destination="nlrtm")
+
+        first, meta = self.provider.list(flt, Page(page=1, pageSize=2))
+        second, _ = self.provider.list(flt, Page(page=2, pageSize=2))
+        everything, _ = self.provider.list(flt, Page(page=1, pageSize=10000))
+
+        assert self.provider._make_request.call_count == 1
+        assert meta.total == 3
+        assert [s.id for s in first + second] == [s.id for s in everything]
+
+        # A different upstream query is a different entry
+        self.provider.list(ScheduleFilter(origin="egaly", destination="esvlc"), Page())
+        assert self.provider._make_request.call_count == 2
+
+    def test_cached_itineraries_expire(self):
+        """Test that itineraries older than the TTL are fetched again."""
+        from unittest.mock import patch
+
+        from backend.app.providers.base import Page, ScheduleFilter
+        from backend.app.providers.searoutes import ITINERARY_CACHE_TTL_SECONDS
+
+        flt = ScheduleFilter(origin="egaly")
+        with patch("backend.app.providers.searoutes.time.monotonic", return_value=1000.0):
+            self.provider.list(flt, Page())
+        with patch(
+            "backend.app.providers.searoutes.time.monotonic",
+            return_value=1000.0 + ITINERARY_CACHE_TTL_SECONDS,
+        ):
+            self.provider.list(flt, Page())
+
+        assert self.provider._make_request.call_count == 2
+
+
+class TestSearoutesRetryBackoff:
+    """Test Retry-After parsing and retry backoff."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        mock_client = Mock()
+        self.provider = SearoutesProvider(client=mock_client)
+
+    def test_parse_retry_after_seconds_and_http_date(self):
+        """Test that both Retry-After forms are understood and junk is ignored."""
+        from email.utils import format_datetime
+        from datetime import datetime, timedelta, timezone
+
+        from backend.app.providers.searoutes import _parse_retry_after
+
+        assert _parse_retry_after("7") == 7.0
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("soon") is None
+
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 <= _parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+        past = datetime.now(timezone.utc) - timedelta(seconds=30)
+        assert _parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+    def test_backoff_honors_retry_after_on_429_and_503(self):
+        """Test that Retry-After wins over jitter for 429 and 503 responses."""
+        for status in (429, 503):
+            response = Mock(status_code=status, headers={"retry-after": "4"})
+            assert self.provider._compute_backoff(1.0, response) == 4.0
+
+    def test_backoff_clamps_long_retry_after(self):
+        """Test that an oversized Retry-After is capped at the backoff ceiling."""
+        from backend.app.providers.searoutes import BACKOFF_CAP_SECONDS
+
+        response = Mock(status_code=429, headers={"retry-after": "3600"})
+        assert self.provider._compute_backoff(1.0, response) == BACKOFF_CAP_SECONDS
+
+    def test_backoff_jitter_is_bounded(self):
+        """Test that decorrelated jitter stays between the base delay and the cap."""
+        from backend.app.providers.searoutes import BACKOFF_BASE_SECONDS, BACKOFF_CAP_SECONDS
+
+        response = Mock(status_code=500, headers={"retry-after": "4"})
+        delay = BACKOFF_BASE_SECONDS
+        for _ in range(20):
+            delay = self.provider._compute_backoff(delay, response)
+            assert BACKOFF_BASE_SECONDS <= delay <= BACKOFF_CAP_SECONDS
+
+    def test_make_request_retries_after_503(self):
+        """Test that a 503 is retried after the advertised delay."""
+        from unittest.mock import patch
+
+        unavailable = Mock(status_code=503, headers={"retry-after": "2"})
+        unavailable.content = b"{}"
+        ok = Mock(status_code=200, headers={})
+        self.provider.client.get = Mock(side_effect=[unavailable, ok])
+
+        with patch("backend.app.providers.searoutes.time.sleep") as sleep:
+            assert self.provider._make_request("/x") is ok
+
+        sleep.assert_called_once_with(2.0)
+
+
+class TestSearoutesCircuitBreaker:
+    """Test that repeated upstream failures trip the circuit breaker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        mock_client = Mock()
+        self.provider = SearoutesProvider(client=mock_client)
+
+    def test_breaker_opens_after_repeated_failures(self):
+        """Test that calls fail fast without hitting the client once the circuit opens."""
+        import httpx
+
+        from backend.app.providers.searoutes import CIRCUIT_FAILURE_THRESHOLD
+
+        self.provider.client.get = Mock(side_effect=httpx.ConnectError("down"))
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(SearoutesError):
+                self.provider._make_request("/x", max_retries=0)
+        assert self.provider.client.get.call_count == CIRCUIT_FAILURE_THRESHOLD
+
+        with pytest.raises(SearoutesError) as exc:
+            self.provider._make_request("/x", max_retries=0)
+        assert exc.value.code == "CIRCUIT_OPEN"
+        assert self.provider.client.get.call_count == CIRCUIT_FAILURE_THRESHOLD
+
+    def test_client_errors_do_not_trip_the_breaker(self):
+        """Test that 4xx responses are not counted as upstream failures."""
+        from backend.app.providers.searoutes import CIRCUIT_FAILURE_THRESHOLD
+
+        not_found = Mock(status_code=404, headers={})
+        not_found.content = b"{}"
+        self.provider.client.get = Mock(return_value=not_found)
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD + 1):
+            with pytest.raises(SearoutesAPIError):
+                self.provider._make_request("/x")
+        assert self.provider.client.get.call_count == CIRCUIT_FAILURE_THRESHOLD + 1
+
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test that one probe goes through after the cool-down and decides the state."""
+        from unittest.mock import patch
+
+        from backend.app.providers.searoutes import _CircuitBreaker
+
+        breaker = _CircuitBreaker(threshold=2, cooldown=30.0)
+        with patch("backend.app.providers.searoutes.time.monotonic", return_value=100.0):
+            breaker.record(failed=True)
+            assert breaker.allow()
+            breaker.record(failed=True)
+            assert not breaker.allow()
+
+        with patch("backend.app.providers.searoutes.time.monotonic", return_value=131.0):
+            assert breaker.allow()
+            assert not breaker.allow()  # only one probe at a time
+            breaker.record(failed=True)
+            assert not breaker.allow()  # failed probe re-opens for another cool-down
+
+        with patch("backend.app.providers.searoutes.time.monotonic", return_value=162.0):
+            assert breaker.allow()
+            breaker.record(failed=False)
+            assert breaker.allow() and breaker.allow()
+
+
+class TestSearoutesItineraryMapping:
+    """Test mapping of Searoutes itineraries into schedules."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        mock_client = Mock()
+        self.provider = SearoutesProvider(client=mock_client)
+
+    def test_direct_itinerary_has_no_leg_detail(self):
+        """Test that single-leg itineraries map without a legs list."""
+        itinerary = {
+            "id": "it-1",
+            "legs": [{"etd": "2025-08-20T10:00:00Z", "eta": "2025-08-25T11:00:00Z"}],
+            "carrier": "MSC",
+        }
+
+        schedule = self.provider._map_single_itinerary(itinerary, None, None)
+
+        assert schedule.routingType == "Direct"
+        assert schedule.transitDays == 6
+        assert schedule.legs is None
+
+    def test_transshipment_legs_use_alternative_field_names(self):
+        """Test that leg fields fall back through their alternative key names."""
+        itinerary = {
+            "id": "it-2",
+            "vessel": "Main Vessel",
+            "legs": [
+                {
+                    "departureTime": "2025-08-20T10:00:00Z",
+                    "arrivalTime": "2025-08-22T10:00:00Z",
+                    "originLocode": "EGALY",
+                    "fromPort": "Alexandria",
+                    "toLocode": "GRPIR",
+                    "destinationPort": "Piraeus",
+                },
+                {
+                    "etd": "2025-08-23T10:00:00Z",
+                    "eta": "2025-08-26T10:00:00Z",
+                    "fromLocode": "GRPIR",
+                    "destinationLocode": "ESVLC",
+                    "vesselName": "Feeder",
+                },
+            ],
+        }
+
+        schedule = self.provider._map_single_itinerary(itinerary, None, None)
+
+        assert schedule.routingType == "Transshipment"
+        first, second = schedule.legs
+        assert (first.fromLocode, first.fromPort, first.toPort) == (
+            "EGALY",
+            "Alexandria",
+            "Piraeus",
+        )
+        assert (first.vessel, first.transitDays) == ("Main Vessel", 2)
+        assert (second.toLocode, second.toPort, second.vessel) == ("ESVLC", "", "Feeder")
+        assert schedule.etd == "2025-08-20T10:00:00Z"
+        assert schedule.eta == "2025-08-26T10:00:00Z"
+
+    def test_resolved_port_labels_override_leg_port_names(self):
+        """Test that resolved port labels win over the legs' own port names."""
+        itinerary = {
+            "legs": [
+                {
+                    "etd": "2025-08-20T10:00:00Z",
+                    "eta": "2025-08-25T10:00:00Z",
+                    "fromPort": "ALY",
+                    "toPort": "VLC",
+                }
+            ]
+        }
+
+        labelled = self.provider._map_single_itinerary(itinerary, "Alexandria, EG", None)
+
+        assert labelled.origin == "Alexandria, EG"
+        assert labelled.destination == "VLC"
+
+    def test_transit_days_round_partial_days_up(self):
+        """Test that computed transit days are the ETD->ETA span rounded up to whole days."""
+        from backend.app.providers.searoutes import _transit_days
+
+        assert _transit_days("2025-08-20T10:00:00Z", "2025-08-25T10:00:00Z") == 5
+        assert _transit_days("2025-08-20T10:00:00Z", "2025-08-25T10:00:01Z") == 6
+        assert _transit_days("2025-08-20T10:00:00Z", "not a date") == 0
+        # Naive and aware timestamps cannot be compared
+        assert _transit_days("2025-08-20T10:00:00", "2025-08-25T10:00:00Z") == 0
+
+    def test_etd_sort_orders_by_instant_not_string(self):
+        """Test that ETDs with different UTC offsets sort by the moment they denote."""
+        from backend.app.models.schedule import Schedule
+
+        def schedule(id_, etd):
+            return Schedule(
+                id=id_,
+                origin="A",
+                destination="B",
+                etd=etd,
+                eta=etd,
+                vessel="V",
+                voyage="1",
+                routingType="Direct",
+                transitDays=1,
+                carrier="C",
+            )
+
+        schedules = [
+            schedule("utc-noon", "2025-08-20T12:00:00Z"),
+            schedule("tokyo-morning", "2025-08-20T15:00:00+09:00"),  # 06:00Z
+            schedule("unparseable", "TBA"),
+            schedule("utc-fraction", "2025-08-20T09:00:00.500Z"),
+        ]
+
+        ordered = self.provider._apply_sorting(schedules, "etd")
+
+        assert [s.id for s in ordered] == [
+            "tokyo-morning",
+            "utc-fraction",
+            "utc-noon",
+            "unparseable",
+        ]
+
+    def test_limited_sort_matches_full_sort_prefix(self):
+        """Test that sorting with a limit returns the same prefix as a full sort, ties included."""
+        from backend.app.models.schedule import Schedule
+
+        schedules = [
+            Schedule(
+                id=str(i),
+                origin="A",
+                destination="B",
+                etd=f"2025-08-{20 + i % 4}T00:00:00Z",
+                eta="2025-09-01T00:00:00Z",
+                vessel="V",
+                voyage="1",
+                routingType="Direct",
+                transitDays=i % 3,
+                carrier="C",
+            )
+            for i in range(12)
+        ]
+
+        for sort_field in ("etd", "transit"):
+            full = self.provider._apply_sorting(schedules, sort_field)
+            limited = self.provider._apply_sorting(schedules, sort_field, limit=5)
+            assert [s.id for s in limited] == [s.id for s in full[:5]]
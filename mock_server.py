@@ -1,13 +1,19 @@
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse, RedirectResponse
+from fastapi import FastAPI, Query, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from typing import Optional, List, Dict, Any
-import json, os, pathlib, datetime, io
+from typing import Optional, List, Dict, Any, Tuple, Callable, Mapping, NamedTuple
+from types import MappingProxyType
+import csv, gzip, hashlib, os, pathlib, datetime, io, sys
+from itertools import islice
+from operator import itemgetter
+import orjson
+from ports_index import PortsIndex, index_ports, search as search_ports
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 
-app = FastAPI(title="Searoutes Schedules Mock", version="0.2")
+app = FastAPI(title="Searoutes Schedules Mock", version="0.2", default_response_class=ORJSONResponse)
 
 # CORS (allow everything for local dev)
 app.add_middleware(
@@ -16,6 +22,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress JSON/CSV bodies of 1KB+ for clients that accept gzip; streamed CSV is compressed
+# chunk by chunk. Responses that already set Content-Encoding (the pre-gzipped execution
+# body) pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
 
 ROOT = pathlib.Path(__file__).parent
 FIX = ROOT / "fixtures"
@@ -28,61 +38,172 @@ app.mount("/ui", StaticFiles(directory=str(ROOT), html=True), name="ui")
 def root():
     return RedirectResponse(url="/ui/viewer.html")
 
-def load_fixture(from_locode: str, to_locode: str, equipment: Optional[str]) -> dict:
+# Parsed JSON files keyed by (path, build); an entry is reused until the file's mtime changes.
+# Callers only read the cached objects (filters build new lists/dicts), never mutate them.
+_FIXTURE_CACHE: Dict[Tuple[str, Any], Tuple[int, Any]] = {}
+
+def _load_json_versioned(path: pathlib.Path, build: Optional[Callable[[Any], Any]] = None) -> Tuple[int, Any]:
+    # (mtime_ns, object) for a JSON file. Raises FileNotFoundError for a missing file,
+    # like stat() itself. `build` derives a search index from the parsed data; it is
+    # cached alongside it.
+    mtime_ns = path.stat().st_mtime_ns
+    key = (str(path), build)
+    ent = _FIXTURE_CACHE.get(key)
+    if ent and ent[0] == mtime_ns:
+        return ent
+    obj = orjson.loads(path.read_bytes())
+    if build:
+        obj = build(obj)
+    ent = _FIXTURE_CACHE[key] = (mtime_ns, obj)
+    return ent
+
+# ----- Conditional GETs -----
+# JSON responses are pure functions of the data files' mtimes and the query, so they carry
+# a weak ETag derived from those; a client that sends it back in If-None-Match gets a
+# bodiless 304 before any filtering or serialization. "no-cache" makes clients revalidate
+# every time, so fixture edits still show up immediately.
+CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+def _etag(*parts: Any) -> str:
+    return 'W/"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored on both sides
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return None
+    tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers={"ETag": etag, **CACHE_HEADERS})
+    return None
+
+def _accepts_gzip(request: Request) -> bool:
+    # True unless Accept-Encoding is absent, omits gzip, or refuses it with q=0
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = params.strip().lower().removeprefix("q=")
+            try:
+                return float(q) > 0 if q else True
+            except ValueError:
+                return False
+    return False
+
+# (FROM, TO, EQUIPMENT or None) -> (fixtures dir mtime, file name the lane resolves to or None).
+# Adding or removing a fixture file changes the directory's mtime, which invalidates the entry.
+_RESOLVED: Dict[Tuple[str, str, Optional[str]], Tuple[int, Optional[str]]] = {}
+_RESOLVED_MAX = 1024
+
+def _resolve_fixture(from_locode: str, to_locode: str, equipment: Optional[str]) -> Optional[str]:
+    try:
+        dir_mtime = FIX.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    lane = (from_locode.upper(), to_locode.upper(), equipment.upper() if equipment else None)
+    ent = _RESOLVED.get(lane)
+    if ent and ent[0] == dir_mtime:
+        return ent[1]
     # Try exact match with equipment first, then common fallbacks
-    candidates = []
-    if equipment:
-        candidates.append(f"{from_locode.upper()}-{to_locode.upper()}-{equipment.upper()}.json")
-    candidates.append(f"{from_locode.upper()}-{to_locode.upper()}-40HC.json")
-    candidates.append(f"{from_locode.upper()}-{to_locode.upper()}-40RF.json")
-    for name in candidates:
-        fpath = FIX / name
-        if fpath.exists():
-            return json.loads(fpath.read_text())
-    return {"items": []}
+    f, t, e = lane
+    candidates = [f"{f}-{t}-{e}.json"] if e else []
+    candidates += [f"{f}-{t}-40HC.json", f"{f}-{t}-40RF.json"]
+    name = next((n for n in candidates if (FIX / n).exists()), None)
+    if len(_RESOLVED) >= _RESOLVED_MAX:
+        _RESOLVED.clear()
+    _RESOLVED[lane] = (dir_mtime, name)
+    return name
+
+def load_fixture(from_locode: str, to_locode: str, equipment: Optional[str]) -> Tuple[str, "Fixture"]:
+    # (version, fixture): version names the file used and its mtime ("" if none matched)
+    name = _resolve_fixture(from_locode, to_locode, equipment)
+    if name:
+        try:
+            mtime_ns, fixture = _load_json_versioned(FIX / name, _index_fixture)
+            return f"{name}@{mtime_ns}", fixture
+        except FileNotFoundError:
+            pass  # deleted since it was resolved; the directory mtime check re-resolves next time
+    return "", NO_FIXTURE
+
+# fromisoformat() accepts a trailing "Z" (as UTC) from Python 3.11 on
+ISO_Z_NATIVE = sys.version_info >= (3, 11)
 
 def parse_dt(s: str | None):
     if not s: return None
+    if not ISO_Z_NATIVE and s[-1:] == "Z":
+        s = s[:-1]
     try:
         return datetime.datetime.fromisoformat(s)
-    except Exception:
-        try:
-            # Try forgiving parse (strip Z if present)
-            return datetime.datetime.fromisoformat(s.replace('Z',''))
-        except Exception:
-            return None
-
-def filter_items(items: List[Dict[str, Any]], carrierScac: Optional[str], fromDate: Optional[str], toDate: Optional[str]) -> List[Dict[str, Any]]:
-    # filter by carrier
-    if carrierScac:
-        c = carrierScac.upper()
-        filt = []
-        for it in items:
-            feats = [f for f in it.get("features", []) if f.get("properties", {}).get("carrierScac","").upper() == c]
-            if feats:
-                filt.append({"hash": it.get("hash"), "features": feats})
-        items = filt
-    # filter by window (first leg departure)
+    except (TypeError, ValueError):
+        return None
+
+# (item, departures aligned with its features, export row or None for an item without features,
+# total transitTimeDays over its features)
+Entry = Tuple[Dict[str, Any], List[Optional[datetime.datetime]], Optional[Dict[str, Any]], int]
+
+class Fixture(NamedTuple):
+    # A parsed fixture file plus what the filters and exports need from it, computed once per load
+    entries: List[Entry]  # one per item, in file order
+    # uppercased carrierScac -> entries for the items with such features, each item narrowed
+    # to just those features (as the carrier filter returns it), in item order
+    by_scac: Dict[str, List[Entry]]
+    # The unfiltered /itinerary/v2/execution body, serialized once, plain and gzipped
+    body: bytes
+    body_gz: bytes
+
+TOTAL_TRANSIT = itemgetter(3)
+
+def _entry(it: Dict[str, Any], deps: List[Optional[datetime.datetime]]) -> Entry:
+    total_transit = sum((f.get("properties") or {}).get("transitTimeDays") or 0 for f in it.get("features", []))
+    return (it, deps, item_row(it), total_transit)
+
+def _index_fixture(data: Dict[str, Any]) -> Fixture:
+    entries = []
+    by_scac: Dict[str, List[Entry]] = {}
+    for it in data.get("items", []):
+        feats = it.get("features", [])
+        deps = []
+        feats_by_scac: Dict[str, List[int]] = {}
+        for j, f in enumerate(feats):
+            props = f.get("properties") or {}
+            # departure parsed here once, so the date window only compares datetimes
+            deps.append(parse_dt((props.get("departure") or {}).get("time")))
+            feats_by_scac.setdefault((props.get("carrierScac") or "").upper(), []).append(j)
+        entries.append(_entry(it, deps))
+        for scac, keep in feats_by_scac.items():
+            narrowed = {"hash": it.get("hash"), "features": [feats[j] for j in keep]}
+            by_scac.setdefault(scac, []).append(_entry(narrowed, [deps[j] for j in keep]))
+    body = orjson.dumps({"items": [e[0] for e in entries]})
+    return Fixture(entries, by_scac, body, gzip.compress(body, compresslevel=6, mtime=0))
+
+# Served when no fixture file matches the lane
+NO_FIXTURE = _index_fixture({"items": []})
+
+def _select(fx: Fixture, carrierScac: Optional[str], fromDate: Optional[str], toDate: Optional[str]) -> List[Entry]:
+    # filter by carrier: a dict lookup returning the prebuilt narrowed items
+    entries = fx.by_scac.get(carrierScac.upper(), []) if carrierScac else fx.entries
+    # filter by window (first leg departure, parsed at load time)
     if fromDate or toDate:
         start = datetime.datetime.fromisoformat(fromDate) if fromDate else None
         end   = datetime.datetime.fromisoformat(toDate) if toDate else None
         win = []
-        for it in items:
-            if not it.get("features"): 
+        for e in entries:
+            deps = e[1]
+            if not deps: 
                 continue
-            first_dep = parse_dt(it["features"][0]["properties"]["departure"]["time"])
+            first_dep = deps[0]
             if first_dep is None: 
                 continue
             if start and first_dep < start: 
                 continue
             if end and first_dep > end: 
                 continue
-            win.append(it)
-        items = win
-    return items
+            win.append(e)
+        entries = win
+    return entries
 
 @app.get("/itinerary/v2/execution")
 def execution(
+    request: Request,
     fromLocode: str = Query(...),
     toLocode: str = Query(...),
     carrierScac: Optional[str] = Query(None),
@@ -91,130 +212,156 @@ def execution(
     equipment: Optional[str] = Query(None),
     sortBy: Optional[str] = Query(None)
 ):
-    data = load_fixture(fromLocode, toLocode, equipment)
-    items = filter_items(data.get("items", []), carrierScac, fromDate, toDate)
+    version, fixture = load_fixture(fromLocode, toLocode, equipment)
+    etag = _etag(version, fromLocode, toLocode, carrierScac, fromDate, toDate, equipment, sortBy)
+    if (not_modified := _not_modified(request, etag)):
+        return not_modified
+    by_transit = bool(sortBy and sortBy.upper() == "TRANSIT_TIME")
+
+    # Whole lane requested: send the bytes serialized at load time
+    if not (carrierScac or fromDate or toDate or by_transit):
+        headers = {"ETag": etag, "Vary": "Accept-Encoding", **CACHE_HEADERS}
+        if _accepts_gzip(request):
+            return Response(fixture.body_gz, media_type="application/json", headers={"Content-Encoding": "gzip", **headers})
+        return Response(fixture.body, media_type="application/json", headers=headers)
 
-    # Optional sort by total transit time
-    if sortBy and sortBy.upper() == "TRANSIT_TIME":
-        def total_transit(it):
-            days = 0
-            for f in it.get("features", []):
-                days += f["properties"].get("transitTimeDays", 0)
-            return days
-        items = sorted(items, key=total_transit)
+    entries = _select(fixture, carrierScac, fromDate, toDate)
 
-    return JSONResponse({"items": items})
+    # Optional sort by total transit time, summed when the fixture was loaded
+    if by_transit:
+        entries = sorted(entries, key=TOTAL_TRANSIT)
+
+    return ORJSONResponse({"items": [e[0] for e in entries]}, headers={"ETag": etag, **CACHE_HEADERS})
 
 # ----- Search helpers (simulate provider helpers) -----
+def _index_ports(ports: List[Dict[str, Any]]) -> Tuple[PortsIndex, Dict[int, bytes]]:
+    # The shared ports index, plus memoized query-less responses (see _default_body)
+    return index_ports(ports), {}
+
+def _index_carriers(carriers: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str, Dict[str, Any]]], Dict[int, bytes]]:
+    # (carriers, [(name lower, scac lower, carrier)], memoized query-less responses)
+    return carriers, [(c.get("name","").lower(), c.get("scac","").lower(), c) for c in carriers], {}
+
+def _default_body(bodies: Dict[int, bytes], limit: int, size: int, ranked: Callable[[int], List[Dict[str, Any]]], headers: Dict[str, str]) -> Response:
+    # A search with no query (the viewer's initial load) is a pure function of the file and
+    # the limit, so its serialized body is kept with the file's index. Every limit >= size
+    # gives the same list, so there are at most size + 1 bodies.
+    key = min(limit, size)
+    body = bodies.get(key)
+    if body is None:
+        body = bodies[key] = orjson.dumps({"items": ranked(key)})
+    return Response(body, media_type="application/json", headers=headers)
+
 @app.get("/ports/search")
-def ports_search(q: str = Query(..., description="name, alias, or LOCODE"), country: Optional[str] = None, limit: int = 15):
-    pth = DATA / "ports.json"
-    if not pth.exists(): return {"items": []}
-    ports = json.loads(pth.read_text())
+def ports_search(request: Request, response: Response, q: str = Query(..., description="name, alias, or LOCODE"), country: Optional[str] = None, limit: int = 15):
+    try:
+        mtime_ns, (index, bodies) = _load_json_versioned(DATA / "ports.json", _index_ports)
+    except FileNotFoundError:
+        return {"items": []}
+    etag = _etag(mtime_ns, q, country, limit)
+    if (not_modified := _not_modified(request, etag)):
+        return not_modified
+    headers = {"ETag": etag, **CACHE_HEADERS}
 
     ql = q.strip().lower()
     cc = country.upper() if country else None
-    scored = []
-    for p in ports:
-        if cc and p.get("country","").upper() != cc:
-            continue
-        hay = [p.get("name",""), p.get("locode",""), p.get("countryName","")] + p.get("aliases",[])
-        hay = [h.lower() for h in hay]
-        if any(ql in h for h in hay):
-            score = 0
-            name = p.get("name","").lower()
-            if ql in name: score -= 10
-            if ql == p.get("locode","").lower(): score -= 20
-            scored.append((score, p))
-    scored.sort(key=lambda x: x[0])
-    return {"items": [s[1] for s in scored[:limit]]}
+    if not ql and not cc and limit >= 0:
+        return _default_body(bodies, limit, len(index.entries), lambda n: search_ports(index, "", None, n), headers)
+    response.headers.update(headers)
+    return {"items": search_ports(index, ql, cc, limit)}
 
 @app.get("/carriers/search")
-def carriers_search(q: Optional[str] = None, limit: int = 15):
-    pth = DATA / "carriers.json"
-    if not pth.exists(): return {"items": []}
-    carr = json.loads(pth.read_text())
+def carriers_search(request: Request, response: Response, q: Optional[str] = None, limit: int = 15):
+    try:
+        mtime_ns, (carr, index, bodies) = _load_json_versioned(DATA / "carriers.json", _index_carriers)
+    except FileNotFoundError:
+        return {"items": []}
+    etag = _etag(mtime_ns, q, limit)
+    if (not_modified := _not_modified(request, etag)):
+        return not_modified
+    headers = {"ETag": etag, **CACHE_HEADERS}
+    if not q and limit >= 0:
+        return _default_body(bodies, limit, len(carr), lambda n: carr[:n], headers)
+    response.headers.update(headers)
     if not q:
         return {"items": carr[:limit]}
     ql = q.strip().lower()
-    out = [c for c in carr if ql in c.get("name","").lower() or ql in c.get("scac","").lower()]
-    return {"items": out[:limit]}
+    matches = (c for name, scac, c in index if ql in name or ql in scac)
+    # Stop scanning once `limit` carriers have matched (a negative limit keeps slice semantics)
+    return {"items": list(islice(matches, limit)) if limit >= 0 else list(matches)[:limit]}
 
 # ----- Export helpers -----
-def map_rows(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    rows = []
-    for it in items:
-        feats = it.get("features", [])
-        if not feats: 
-            continue
-        legs = []
-        for i, f in enumerate(feats, start=1):
-            p = f.get("properties", {})
-            legs.append({
-                "seq": i,
-                "fromLocode": p.get("departure", {}).get("locode"),
-                "fromTime": p.get("departure", {}).get("time"),
-                "toLocode": p.get("arrival", {}).get("locode"),
-                "toTime": p.get("arrival", {}).get("time"),
-                "carrier": p.get("carrier"),
-                "scac": p.get("carrierScac"),
-                "service": p.get("serviceId"),
-                "vessel": (p.get("vessel") or {}).get("name"),
-                "imo": (p.get("vessel") or {}).get("imo"),
-                "voyage": (p.get("vessel") or {}).get("voyage"),
-                "transitDays": p.get("transitTimeDays"),
-            })
-        first = legs[0]
-        last  = legs[-1]
-        routing = "Direct" if len(legs) <= 1 else f"Transshipment ×{len(legs)-1}"
-        total_transit = sum(l.get("transitDays") or 0 for l in legs)
-        rows.append({
-            "DepartureLocode": first["fromLocode"],
-            "ETD": first["fromTime"],
-            "ArrivalLocode": last["toLocode"],
-            "ETA": last["toTime"],
-            "Carrier": first["carrier"],
-            "SCAC": first["scac"],
-            "Service": first["service"],
-            "Vessel": first["vessel"],
-            "Voyage": first["voyage"],
-            "IMO": first["imo"],
-            "TransitDays": total_transit,
-            "LegsCount": len(legs),
-            "RoutingType": routing,
-        })
-    return rows
+# Shared read-only default for the nested .get() lookups in item_row
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def item_row(it: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Export row for one itinerary; None if it has no legs. Built once per fixture
+    # load by _index_fixture, so exports only look rows up. The row reads the first
+    # and last legs only, plus every leg's transit days.
+    feats = it.get("features", [])
+    if not feats: 
+        return None
+    legs = [f.get("properties", _EMPTY) for f in feats]
+    first, last = legs[0], legs[-1]
+    departure = first.get("departure", _EMPTY)
+    arrival = last.get("arrival", _EMPTY)
+    vessel = first.get("vessel") or _EMPTY
+    routing = "Direct" if len(legs) <= 1 else f"Transshipment ×{len(legs)-1}"
+    total_transit = sum(p.get("transitTimeDays") or 0 for p in legs)
+    return {
+        "DepartureLocode": departure.get("locode"),
+        "ETD": departure.get("time"),
+        "ArrivalLocode": arrival.get("locode"),
+        "ETA": arrival.get("time"),
+        "Carrier": first.get("carrier"),
+        "SCAC": first.get("carrierScac"),
+        "Service": first.get("serviceId"),
+        "Vessel": vessel.get("name"),
+        "Voyage": vessel.get("voyage"),
+        "IMO": vessel.get("imo"),
+        "TransitDays": total_transit,
+        "LegsCount": len(legs),
+        "RoutingType": routing,
+    }
+
+class _Echo:
+    # Write-only file object for csv.writer: write() hands the formatted row back
+    def write(self, value: str) -> str:
+        return value
 
 @app.get("/export/csv")
 def export_csv(fromLocode: str, toLocode: str, carrierScac: Optional[str] = None, fromDate: Optional[str] = None, toDate: Optional[str] = None, equipment: Optional[str] = None):
-    data = load_fixture(fromLocode, toLocode, equipment)
-    items = filter_items(data.get("items", []), carrierScac, fromDate, toDate)
-    rows = map_rows(items)
+    _, fixture = load_fixture(fromLocode, toLocode, equipment)
+    # Export rows were built when the fixture was loaded; items without legs have none
+    rows = [e[2] for e in _select(fixture, carrierScac, fromDate, toDate) if e[2]]
     headers = ["DepartureLocode","ETD","ArrivalLocode","ETA","Carrier","SCAC","Service","Vessel","Voyage","IMO","TransitDays","LegsCount","RoutingType"]
-    lines = [",".join(headers)]
-    def esc(v): 
-        s = "" if v is None else str(v)
-        return '"' + s.replace('"','""') + '"'
-    for r in rows:
-        lines.append(",".join(esc(r[h]) for h in headers))
-    import io
-    csv_bytes = ("\n".join(lines)).encode("utf-8")
+    # Every cell quoted (None -> ""), formatted by the C csv writer; the empty line
+    # terminator makes writerow() return just the row
+    writer = csv.writer(_Echo(), quoting=csv.QUOTE_ALL, lineterminator="")
+    # Yield the header, then one line per row as it is formatted, so the body is never
+    # held in memory as a whole. Lines are "\n"-separated with no trailing newline.
+    def iter_csv():
+        yield ",".join(headers)
+        for r in rows:
+            yield "\n" + writer.writerow([r[h] for h in headers])
     fname = f"schedules_{fromLocode}_{toLocode}.csv"
-    return StreamingResponse(io.BytesIO(csv_bytes), media_type="text/csv", headers={"Content-Disposition": f'attachment; filename=\"{fname}\"'})
+    return StreamingResponse(iter_csv(), media_type="text/csv", headers={"Content-Disposition": f'attachment; filename=\"{fname}\"'})
 
 @app.get("/export/xlsx")
 def export_xlsx(fromLocode: str, toLocode: str, carrierScac: Optional[str] = None, fromDate: Optional[str] = None, toDate: Optional[str] = None, equipment: Optional[str] = None):
-    data = load_fixture(fromLocode, toLocode, equipment)
-    items = filter_items(data.get("items", []), carrierScac, fromDate, toDate)
-    rows = map_rows(items)
+    _, fixture = load_fixture(fromLocode, toLocode, equipment)
+    # Export rows were built when the fixture was loaded; items without legs have none
+    rows = [e[2] for e in _select(fixture, carrierScac, fromDate, toDate) if e[2]]
 
-    wb = Workbook(); ws = wb.active; ws.title = "Schedules"
+    # Write-only mode streams rows into the sheet XML instead of keeping a Cell object
+    # per value; column widths have to be set before the first row is appended
+    wb = Workbook(write_only=True); ws = wb.create_sheet("Schedules")
     headers = ["DepartureLocode","ETD","ArrivalLocode","ETA","Carrier","SCAC","Service","Vessel","Voyage","IMO","TransitDays","LegsCount","RoutingType"]
-    ws.append(headers)
-    for r in rows: ws.append([r.get(h) for h in headers])
     widths = [16,20,16,20,20,8,10,22,10,12,12,10,16]
     for i,w in enumerate(widths, start=1):
         ws.column_dimensions[get_column_letter(i)].width = w
+    ws.append(headers)
+    for r in rows: ws.append([r.get(h) for h in headers])
     import io
     bio = io.BytesIO(); wb.save(bio); bio.seek(0)
     fname = f"schedules_{fromLocode}_{toLocode}.xlsx"
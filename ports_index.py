@@ -0,0 +1,75 @@
+"""Port search index shared by mock_server's /ports/search and routes/ports.py.
+
+Every searched field is lowercased once when the index is built; a search is then a
+C-level substring scan plus scoring of the matches only.
+"""
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import heapq
+
+# Separates fields in the search haystacks; never part of a port field
+HAY_SEP = "\0"
+SCORE_KEY = itemgetter(0)
+
+class PortsIndex(NamedTuple):
+    # Per port, in file order: (country upper, lowercased name/locode/countryName/aliases
+    # joined by HAY_SEP, name lower, locode lower, port)
+    entries: List[Tuple[str, str, str, str, Dict[str, Any]]]
+    text: str  # every entry's haystack joined by HAY_SEP
+    starts: List[int]  # starts[i]: offset of entry i's haystack in text
+    by_country: Dict[str, List[int]]  # country upper -> entry positions, in file order
+
+def index_ports(ports: List[Dict[str, Any]]) -> PortsIndex:
+    entries, hays, starts = [], [], []
+    by_country: Dict[str, List[int]] = {}
+    offset = 0
+    for i, p in enumerate(ports):
+        name, locode, country = p.get("name", ""), p.get("locode", ""), p.get("country", "").upper()
+        hay = HAY_SEP.join([name, locode, p.get("countryName", "")] + (p.get("aliases") or [])).lower()
+        entries.append((country, hay, name.lower(), locode.lower(), p))
+        hays.append(hay)
+        starts.append(offset)
+        offset += len(hay) + len(HAY_SEP)
+        by_country.setdefault(country, []).append(i)
+    return PortsIndex(entries, HAY_SEP.join(hays), starts, by_country)
+
+def _text_matches(index: PortsIndex, ql: str) -> List[int]:
+    # Positions of the entries whose haystack contains ql, ascending. str.find scans the
+    # joined text in C; after a hit it resumes at the next entry
+    text, starts = index.text, index.starts
+    matches = []
+    pos = text.find(ql)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        matches.append(i)
+        if i + 1 == len(starts):
+            break
+        pos = text.find(ql, starts[i + 1])
+    return matches
+
+def search(index: PortsIndex, ql: str, cc: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    """Best `limit` ports for a lowercased, stripped query and an optional uppercased
+    country code: exact LOCODE first, then name matches, ties in file order."""
+    if HAY_SEP in ql:
+        return []
+    entries = index.entries
+    if cc:
+        # A country filter only visits that country's ports
+        positions = [i for i in index.by_country.get(cc, ()) if ql in entries[i][1]]
+    else:
+        positions = _text_matches(index, ql)
+
+    scored = []
+    for i in positions:
+        _, _, name_l, locode_l, p = entries[i]
+        score = 0
+        if ql == locode_l: score -= 20
+        if ql in name_l: score -= 10
+        scored.append((score, p))
+
+    if limit >= 0:
+        # Top `limit` without sorting every match; nsmallest is stable like sort()
+        return [p for _, p in heapq.nsmallest(limit, scored, key=SCORE_KEY)]
+    scored.sort(key=SCORE_KEY)
+    return [p for _, p in scored[:limit]]
@@ -1,10 +1,13 @@
 # backend/app/routes/ports.py
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List, Dict, Any
 from pathlib import Path
-import json
+import orjson
 
-router = APIRouter()
+from ports_index import index_ports, search as search_ports
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Expected data layout:
 # backend/
@@ -22,9 +25,10 @@ def _read_ports() -> List[Dict[str, Any]]:
     if not PORTS_PATH.exists():
         # Minimal fallback to avoid 500s if file is missing
         return [{"name": "Alexandria", "locode": "EGALY", "country": "EG", "countryName": "Egypt", "aliases": ["ALX"]}]
-    return json.loads(PORTS_PATH.read_text(encoding="utf-8"))
+    return orjson.loads(PORTS_PATH.read_bytes())
 
 PORTS = _read_ports()
+PORTS_INDEX = index_ports(PORTS)
 
 @router.get("/search")
 def ports_search(
@@ -35,22 +39,5 @@ def ports_search(
     ql = q.strip().lower()
     cc = country.upper() if country else None
 
-    results: List[Dict[str, Any]] = []
-    for p in PORTS:
-        if cc and p.get("country", "").upper() != cc:
-            continue
-        hay = [p.get("name",""), p.get("locode",""), p.get("countryName","")] + (p.get("aliases") or [])
-        hay_l = [h.lower() for h in hay]
-        if any(ql in h for h in hay_l):
-            # simple score: exact locode match best, then name match
-            score = 0
-            if ql == p.get("locode","").lower(): score -= 30
-            if ql in p.get("name","").lower():  score -= 10
-            results.append({"_score": score, **p})
-
-    results.sort(key=lambda r: r["_score"])
-    for r in results:
-        r.pop("_score", None)
-
     # Return uniform shape; frontend expects: { items: [...] }
-    return {"items": results[:limit]}
+    return {"items": search_ports(PORTS_INDEX, ql, cc, limit)}
@@ -0,0 +1,66 @@
+import asyncio
+import httpx
+import orjson
+import pytest
+from adapter.searoutes_adapter import SearoutesAdapter
+
+ITEM = {"hash": "h1", "features": [{"properties": {
+    "departure": {"locode": "EGALY", "time": "2025-08-20T10:00:00"},
+    "arrival": {"locode": "MATNG", "time": "2025-08-25T10:00:00"},
+    "carrier": "MSC", "carrierScac": "MSCU", "transitTimeDays": 5,
+}}]}
+
+def handler(request):
+    if request.url.params["toLocode"] == "XXBAD":
+        return httpx.Response(500, json={"error": "boom"})
+    return httpx.Response(200, content=orjson.dumps({"items": [ITEM]}))
+
+@pytest.fixture
+def mocked_async_client(monkeypatch):
+    requests = []
+    def counting(request):
+        requests.append(request)
+        return handler(request)
+    real = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kw: real(transport=httpx.MockTransport(counting), **kw))
+    return requests
+
+def test_search_many_keeps_good_lanes_when_one_fails(mocked_async_client):
+    lanes = [("EGALY", "MATNG"), ("EGALY", "XXBAD"), ("egaly", "matng")]
+    with SearoutesAdapter(base_url="http://mock") as adapter:
+        results = asyncio.run(adapter.search_many(lanes))
+    assert [r["hash"] for r in results[0]] == ["h1"]
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[2] == results[0]
+    # The duplicate lane shared the first lane's request
+    assert len(mocked_async_client) == 2
+
+@pytest.fixture
+def adapter():
+    requests = []
+    def counting(request):
+        requests.append(request)
+        return handler(request)
+    with SearoutesAdapter(base_url="http://mock") as a:
+        a.client.close()
+        a.client = httpx.Client(base_url="http://mock", transport=httpx.MockTransport(counting))
+        a.requests = requests
+        yield a
+
+def test_cached_rows_are_not_shared_with_callers(adapter):
+    rows = adapter.search("EGALY", "MATNG")
+    rows[0]["carrier"] = "edited"
+    rows[0]["legs"][0]["carrier"] = "edited"
+    rows.clear()
+    again = adapter.search("EGALY", "MATNG")
+    assert again[0]["carrier"] == "MSC"
+    assert again[0]["legs"][0]["carrier"] == "MSC"
+    assert len(adapter.requests) == 1
+
+def test_equivalent_dates_share_a_cache_entry(adapter):
+    adapter.search("EGALY", "MATNG", "2025-09-01", "2025-09-05T00:00:00Z")
+    adapter.search("EGALY", "MATNG", "2025-09-01T00:00:00", "2025-09-05T00:00:00.000+00:00")
+    assert len(adapter.requests) == 1
+    # A naive time is not assumed to be UTC
+    adapter.search("EGALY", "MATNG", "2025-09-01T00:00:00Z", "2025-09-05T00:00:00Z")
+    assert len(adapter.requests) == 2